@@ -8,28 +8,113 @@ triggered using this cli, most of them require common configuration.
 """
 import csv
 import sys
+import ast
+import pkgutil
+import pathlib
 import argparse
+import warnings
+import importlib
 import contextlib
 from typing import Optional
 
 from clldutils.clilib import (
-    register_subcommands, get_parser_and_subparsers, ParserError, add_csv_field_size_limit,
-    add_random_seed,
+    get_parser_and_subparsers, ParserError, add_csv_field_size_limit, add_random_seed, Formatter,
 )
 from clldutils.loglib import Logging
+from clldutils import jsonlib
 from cldfcatalog import Config
 
 import cldfbench
 from cldfbench.catalogs import BUILTIN_CATALOGS
 from cldfbench.cli_util import IGNORE_MISSING
-from cldfbench.util import colored
-import cldfbench.commands
+from cldfbench.util import colored, get_entrypoints, cache_dir
+
+COMMANDS_MANIFEST = 'commands.json'
 
 
 def print_red(text, **kw):  # pylint: disable=C0116
     print(colored('red', text, **kw))
 
 
+def _iter_command_modules(pkg: str, prefix: Optional[str] = None):
+    """
+    Yield (command name, module name, module path) triples for the modules in a package - without
+    importing the modules.
+    """
+    spec = importlib.util.find_spec(pkg)
+    for info in pkgutil.iter_modules(spec.submodule_search_locations or []):
+        if not info.ispkg:
+            modname = f'{pkg}.{info.name}'
+            yield (
+                f'{prefix}.{info.name}' if prefix else info.name,
+                modname,
+                importlib.util.find_spec(modname).origin)
+
+
+def _discover_commands(entry_point: str = 'cldfbench.commands') -> dict[str, tuple[str, str]]:
+    """
+    Discover available commands, mapping command names to pairs (module name, help).
+
+    Commands are identified by (<entry point name>).<module name>. The help text is read from the
+    module's docstring - without importing the module - and cached in a manifest file.
+    """
+    fname = cache_dir() / COMMANDS_MANIFEST
+    try:
+        manifest = jsonlib.load(fname) if fname.exists() else {}
+    except ValueError:  # pragma: no cover
+        manifest = {}
+
+    mods = list(_iter_command_modules('cldfbench.commands'))
+    for ep in get_entrypoints(entry_point):
+        try:
+            mods.extend(_iter_command_modules(ep.value, prefix=ep.name))
+        except ImportError:  # pragma: no cover
+            warnings.warn(f'ImportError loading entry point {ep.name}')
+
+    res, changed = {}, False
+    for name, modname, path in mods:
+        stat = pathlib.Path(path).stat()
+        key = [stat.st_mtime_ns, stat.st_size]
+        if manifest.get(path, [None])[0] != key:
+            doc = ast.get_docstring(ast.parse(pathlib.Path(path).read_bytes()), clean=False)
+            manifest[path] = [key, doc.strip().splitlines()[0] if doc and doc.strip() else doc]
+            changed = True
+        res[name] = (modname, manifest[path][1])
+
+    if changed:
+        try:
+            jsonlib.dump(manifest, fname, indent=2)
+        except OSError:  # pragma: no cover
+            pass
+    return res
+
+
+def register_subcommands(subparsers, args: Optional[list[str]] = None):
+    """
+    Register the available commands with the CLI parser.
+
+    Only the module implementing the command selected in `args` is imported - and its `register`
+    function called. All other commands are only listed with their help text.
+    """
+    cmds = _discover_commands()
+    args = sys.argv[1:] if args is None else args
+    selected = next((arg for arg in args if arg in cmds), None)
+    for name, (modname, help_) in cmds.items():
+        if name == selected:
+            mod = importlib.import_module(modname)
+            if not mod.__doc__:  # pragma: no cover
+                raise ValueError(f'Command \"{name}\" is missing a docstring.')
+            if not getattr(mod, 'run', None):  # pragma: no cover
+                raise ValueError(f'Command \"{name}\" is missing a run function.')
+            subparser = subparsers.add_parser(
+                name, help=help_, description=mod.__doc__, formatter_class=Formatter)
+            if hasattr(mod, 'register'):
+                mod.register(subparser)
+            subparser.set_defaults(main=mod.run)
+        elif help_ is not None:
+            subparsers.add_parser(name, help=help_)
+
+
 def _add_catalog(
         cls: type,
         cfg: Config,
@@ -68,9 +153,7 @@ def main(args=None, catch_all=False, parsed_args=None, log=None):  # pylint: dis
     add_csv_field_size_limit(parser, default=csv.field_size_limit())
     add_random_seed(parser)
 
-    # Discover available commands:
-    # Commands are identified by (<entry point name>).<module name>
-    register_subcommands(subparsers, cldfbench.commands, entry_point='cldfbench.commands')
+    register_subcommands(subparsers, args)
 
     args = parsed_args or parser.parse_args(args=args)
     if not hasattr(args, "main"):
@@ -4,6 +4,7 @@ Backwards compatibility with supported python versions.
 import sys
 import datetime
 import functools
+import importlib.metadata
 
 
 if (sys.version_info.major, sys.version_info.minor) >= (3, 10):  # pragma: no cover
@@ -17,8 +18,37 @@ else:
         return eps.get(group, [])
 
 
+if (sys.version_info.major, sys.version_info.minor) >= (3, 10):  # pragma: no cover
+    packages_distributions = importlib.metadata.packages_distributions
+else:  # pragma: no cover
+    def packages_distributions():
+        """`importlib.metadata.packages_distributions` was added in py3.10."""
+        return {}
+
+
 if (sys.version_info.major, sys.version_info.minor) >= (3, 11):  # pragma: no cover
     # datetime.UTC was added in py3.11.
     utcnow = functools.partial(datetime.datetime.now, datetime.UTC)
 else:  # pragma: no cover
     utcnow = datetime.datetime.utcnow
+
+
+try:  # pragma: no cover
+    from compression import zstd  # Python >= 3.14
+except ImportError:  # pragma: no cover
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+
+def zstd_open(fname, mode, level=None):  # pragma: no cover
+    """
+    Open a zstd compressed file, hiding the differences between the APIs of `compression.zstd`
+    and the `zstandard` package.
+    """
+    if level is None:
+        return zstd.open(fname, mode)
+    if zstd.__name__ == 'zstandard':
+        return zstd.open(fname, mode, cctx=zstd.ZstdCompressor(level=level))
+    return zstd.open(fname, mode, level=level)
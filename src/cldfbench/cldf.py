@@ -1,24 +1,248 @@
 """
 Functionality to be plugged into cldfbench datasets to make writing of CLDF datasets easier.
 """
+import io
+import os
 import sys
+import gzip
+import queue
+import pickle
 import shutil
+import hashlib
 import pathlib
+import functools
+import zipfile
+import contextlib
+import itertools
+import threading
+import tempfile
 import argparse
+import multiprocessing
 import collections
 import dataclasses
-from typing import Optional, Union
+import concurrent.futures
+from typing import Optional, Union, Any
+from collections.abc import Iterable, Generator, Callable
 
 from csvw.metadata import Link, Table, Column
 import pycldf
 from pycldf.dataset import get_module_impl, get_modules, MD_SUFFIX, Dataset, SchemaObjectType
 from pycldf.util import pkg_path
+from pycldf.sources import Sources
+from clldutils.path import md5
 from cldfcatalog import Repository
 
 from cldfbench.catalogs import Catalog
-from cldfbench.util import iter_requirements
+from cldfbench.util import iter_requirements, cache_dir
+from cldfbench._compat import zstd, zstd_open
 
-__all__ = ['CLDFWriter', 'CLDFSpec']
+__all__ = ['CLDFWriter', 'CLDFSpec', 'provenance_cache']
+
+COMPRESSION_SUFFIXES = {'zip': '.zip', 'gzip': '.gz', 'zstd': '.zst'}
+# Files in the CLDF directory which are not removed when cleaning the directory:
+KEEP_FILES = ['.gitattributes', 'README.md']
+
+
+class DiskBuffer:
+    """
+    A list-like, append-only container for rows, which pickles items to a temporary file rather
+    than keeping them in memory.
+
+    Only the parts of the `list` API which make sense for collecting rows are supported, i.e.
+    `append`, `extend`, `len` and iteration.
+    """
+    def __init__(self):
+        self._fp = tempfile.TemporaryFile()
+        self._pickler = pickle.Pickler(self._fp, protocol=pickle.HIGHEST_PROTOCOL)
+        self._len = 0
+
+    def append(self, item: Any):  # pylint: disable=C0116
+        self._pickler.dump(item)
+        # The pickler's memo would keep references to all items, thus defeating the purpose.
+        self._pickler.clear_memo()
+        self._len += 1
+
+    def extend(self, items: Iterable[Any]):  # pylint: disable=C0116
+        for item in items:
+            self.append(item)
+
+    def __len__(self):
+        return self._len
+
+    def __bool__(self):
+        return bool(self._len)
+
+    def __iter__(self) -> Generator[Any, None, None]:
+        self._fp.flush()
+        pos = self._fp.tell()
+        self._fp.seek(0)
+        try:
+            unpickler = pickle.Unpickler(self._fp)
+            for _ in range(self._len):
+                yield unpickler.load()
+        finally:
+            self._fp.seek(pos)
+
+    def close(self):
+        """Remove the temporary file."""
+        self._fp.close()
+
+
+def _batched(items: Iterable[Any], size: int) -> Generator[list[Any], None, None]:
+    items = iter(items)
+    while True:
+        batch = list(itertools.islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+@contextlib.contextmanager
+def _compressed(target: pathlib.Path, name: str, codec: str, level: Optional[int] = None):
+    """
+    Open a binary stream to write data compressed with `codec` to `target`.
+
+    :param name: Name of the data in the zip archive or gzip header. Since no timestamps are \
+    stored, compressing identical data results in identical files.
+    """
+    if codec == 'zip':
+        info = zipfile.ZipInfo(name)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info._compresslevel = level  # pylint: disable=W0212
+        info.external_attr = 0o644 << 16
+        with zipfile.ZipFile(target, 'w') as zipf, zipf.open(info, 'w', force_zip64=True) as fp:
+            yield fp
+    elif codec == 'gzip':
+        with target.open('wb') as raw, gzip.GzipFile(
+                filename=name,
+                mode='wb',
+                compresslevel=9 if level is None else level,
+                fileobj=raw,
+                mtime=0) as fp:
+            yield fp
+    else:  # pragma: no cover
+        if not zstd:
+            raise EnvironmentError(
+                'Writing zstd compressed data requires the zstandard package\n'
+                'pip install cldfbench[zstd]')
+        with zstd_open(target, 'wb', level=level) as fp:
+            yield fp
+
+
+@dataclasses.dataclass
+class _FileState:
+    """Size, modification time and - if computed upfront - md5 checksum of a file."""
+    path: pathlib.Path
+    size: int
+    mtime_ns: int
+    checksum: Optional[str] = None
+
+    @classmethod
+    def of(cls, p: pathlib.Path, checksum: bool = False) -> '_FileState':
+        stat = p.stat()
+        return cls(p, stat.st_size, stat.st_mtime_ns, md5(p) if checksum else None)
+
+    def unchanged(self, p: pathlib.Path) -> bool:
+        """Whether `p` is the described file, with unchanged size and modification time."""
+        stat = p.stat()
+        return p == self.path and (stat.st_size, stat.st_mtime_ns) == (self.size, self.mtime_ns)
+
+    def same_content(self, p: pathlib.Path) -> bool:
+        return p.stat().st_size == self.size and (self.checksum or md5(self.path)) == md5(p)
+
+
+@contextlib.contextmanager
+def _replace_if_changed(target: pathlib.Path, previous: Optional[_FileState] = None):
+    """
+    Context manager yielding the path of a temporary file to write the new content of `target`
+    to.
+
+    Upon exit, the temporary file replaces `target` - unless its content is identical to the
+    `previous` content. Then `target` is left untouched or - if it has been overwritten in the
+    meantime, or if it is a copy in a staging directory - its previous modification time is
+    restored.
+    """
+    tmp = target.parent / f'.{target.name}.tmp'
+    try:
+        yield tmp
+        if not tmp.exists():  # Nothing was written.
+            return
+        if previous and previous.same_content(tmp):
+            if target.exists() and previous.unchanged(target):
+                return
+            tmp.replace(target)
+            os.utime(target, ns=(previous.mtime_ns, previous.mtime_ns))
+        else:
+            tmp.replace(target)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+_PROVENANCE: Optional[dict[tuple[str, str], Optional[dict]]] = None
+
+
+@contextlib.contextmanager
+def provenance_cache():
+    """
+    Context manager, within which the JSON-LD descriptions of repositories - whose computation
+    requires calls to `git` - are cached by `CLDFWriter`, i.e. computed only once per repository.
+
+    .. code-block:: python
+
+        >>> with provenance_cache():
+        ...     for spec in cldf_specs:
+        ...         with CLDFWriter(spec, dataset=ds):
+        ...             pass
+    """
+    global _PROVENANCE  # pylint: disable=W0603
+    if _PROVENANCE is not None:  # We are already within a provenance_cache context.
+        yield
+        return
+    _PROVENANCE = {}
+    try:
+        yield
+    finally:
+        _PROVENANCE = None
+
+
+def _provenance_key(repo: Any) -> tuple[str, str]:
+    """Identify a repository (or catalog) by class and directory."""
+    d = getattr(repo, 'dir', None)
+    return repo.__class__.__name__, str(pathlib.Path(d).resolve()) if d else str(id(repo))
+
+
+def _cached_json_ld(key: tuple[str, str], func: Callable[[], Optional[dict]]) -> Optional[dict]:
+    if _PROVENANCE is None:
+        return func()
+    if key not in _PROVENANCE:
+        _PROVENANCE[key] = func()
+    return _PROVENANCE[key]
+
+
+def _repository_json_ld(path: pathlib.Path) -> Optional[dict]:
+    try:
+        repo = Repository(path)
+    except ValueError:
+        return None
+    return repo.json_ld()
+
+
+def _dataset_repository_json_ld(repo: Repository) -> Optional[dict]:
+    try:
+        return repo.json_ld()
+    except:  # pragma: no cover  # noqa: E722  # pylint: disable=W0702
+        # If a git repository has no commit, git describe fails.
+        return None
+
+
+_WRITE_JOB = None
+
+
+def _write_table_job(table_type: str) -> int:
+    writer, table_items, compressed = _WRITE_JOB
+    return writer._write_table(  # pylint: disable=W0212
+        table_type, table_items[table_type], table_type in compressed)
 
 
 class CLDFWriter:
@@ -30,7 +254,8 @@ class CLDFWriter:
 
     :ivar cldf_spec: :class:`CLDFSpec` instance, configuring the CLDF dataset written by the writer.
     :ivar objects: `dict` of `list` s to collect the data items. Will be passed as kwargs to \
-    `pycldf.Dataset.write`.
+    `pycldf.Dataset.write`. If `CLDFSpec.buffer_on_disk` is set, the lists are replaced by \
+    :class:`DiskBuffer` instances.
 
     Usage:
 
@@ -38,6 +263,7 @@ class CLDFWriter:
 
         >>> with Writer(cldf_spec) as writer:
         ...     writer.objects['ValueTable'].append(...)
+        ...     writer.add_rows('ParameterTable', [...])
     """
     def __init__(self,
                  cldf_spec: Optional['CLDFSpec'] = None,
@@ -51,11 +277,18 @@ class CLDFWriter:
         :param clean: `bool` flag signaling whether to clean the CLDF dir before writing.
         """
         self.cldf_spec: CLDFSpec = cldf_spec or CLDFSpec(dir=getattr(dataset, 'cldf_dir', '.'))
-        self.objects: dict[str, list] = collections.defaultdict(list)
+        self.objects: dict[str, Union[list, DiskBuffer]] = collections.defaultdict(
+            DiskBuffer if self.cldf_spec.buffer_on_disk else list)
         self.args = args
         self.dataset = dataset
         self._cldf = None
         self._clean = clean
+        self._queue, self._worker, self._error = None, None, None
+        self._target_spec = None
+        # State of existing files, files to be removed and files written by this writer:
+        self._previous: dict[str, _FileState] = {}
+        self._stale: list[pathlib.Path] = []
+        self._outputs: set[pathlib.Path] = set()
 
     @property
     def cldf(self) -> pycldf.Dataset:
@@ -78,7 +311,8 @@ class CLDFWriter:
         """
         Upon entering the writer context
 
-        - the target directory is cleaned up,
+        - the target directory is cleaned up - or, if `CLDFSpec.staged` is set, a staging \
+          directory is created,
         - the CLDF metadata is initialized and
         - provided as attribute `cldf`.
 
@@ -90,10 +324,23 @@ class CLDFWriter:
           `<https://pycldf.readthedocs.io/en/latest/dataset.html#adding-data>`
         - data items can be appended to `self.objects`.
         """
-        if self._clean:
-            self.cldf_spec.make_clean()
+        if self.cldf_spec.dir.exists():
+            self._previous = {
+                p.name: _FileState.of(p, checksum=p == self.cldf_spec.metadata_path)
+                for p in self.cldf_spec.dir.iterdir() if p.is_file()}
+        if self.cldf_spec.staged:
+            self._target_spec = self.cldf_spec
+            self.cldf_spec = dataclasses.replace(
+                self.cldf_spec, dir=self.cldf_spec.make_staging_dir(clean=self._clean))
+        elif self._clean:
+            # Files are only removed after writing, if they haven't been re-written, to keep
+            # files with unchanged content untouched.
+            self._stale = self.cldf_spec.make_clean(remove=False)
         self.cldf_spec.copy_metadata()
         self._cldf = self.cldf_spec.get_dataset()
+        if self._stale:
+            # Stale sources - which are only removed after writing - must not be read:
+            self._cldf.sources = Sources()
         for comp, fname in self.cldf_spec.data_fnames.items():
             try:
                 t = self._cldf[comp]
@@ -105,8 +352,113 @@ class CLDFWriter:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
         When exiting the writer context, write data (and metadata) to disk.
+
+        If `CLDFSpec.staged` is set, the data is only written - and the staging directory swapped
+        in - if the context is exited without exception.
+        """
+        staging = self.cldf_spec.dir if self._target_spec else None
+        try:
+            self._stop_worker()
+            if not (staging and exc_type):
+                self.write(zipped=self.cldf_spec.zipped, **self.objects)
+                for p in self._stale:
+                    if p not in self._outputs and p.exists() \
+                            and self._previous[p.name].unchanged(p):
+                        p.unlink()
+                if staging:
+                    # From now on, swap_in is responsible for the staging directory, which may
+                    # hold content moved over from the cldf directory:
+                    staging, swapped = None, staging
+                    self._target_spec.swap_in(swapped)
+        finally:
+            for items in self.objects.values():
+                if isinstance(items, DiskBuffer):
+                    items.close()
+            if self._target_spec:
+                if staging:
+                    shutil.rmtree(staging)
+                self.cldf_spec, self._target_spec = self._target_spec, None
+
+    def _validated(self, component: str, rows: list[dict], offset: int) -> list[dict]:
+        """
+        Convert the values in `rows` to the Python objects described by the column datatypes.
+
+        :raises ValueError: If a value cannot be serialized and read back according to the \
+        column specification (e.g. because a required value is missing).
+        """
+        cols = [c for c in self.cldf[component].tableSchema.columns if not c.virtual]
+        res = []
+        for i, row in enumerate(rows, start=offset + 1):
+            converted = {}
+            for col in cols:
+                try:
+                    converted[col.header] = col.read(
+                        col.write(row.get(col.header, row.get(f'{col}'))))
+                except (ValueError, TypeError) as e:
+                    raise ValueError(f'{component} row {i}, column {col.header}: {e}') from e
+            res.append(converted)
+        return res
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if self._error is None:
+                component, batch = item
+                try:
+                    self.objects[component].extend(
+                        self._validated(component, batch, len(self.objects[component])))
+                except Exception as e:  # pylint: disable=W0718
+                    self._error = e
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _stop_worker(self):
+        if self._worker:
+            self._queue.put(None)
+            self._worker.join()
+            self._queue, self._worker = None, None
+        self._raise_error()
+
+    def add_rows(self, component: str, rows: Iterable[dict], batch_size: int = 1000):
+        """
+        Validate rows for a component in batches and append them to `self.objects[component]`.
+
+        Other than rows appended to `self.objects` directly - which are only checked when the
+        data is written - rows passed to `add_rows` are converted according to the datatypes of
+        the table's columns right away, thus errors are detected early.
+
+        If `CLDFSpec.background_validation` is set, validation (and buffering, see
+        `CLDFSpec.buffer_on_disk`) is done in a background thread, while `add_rows` returns
+        after queueing the rows. Errors are then raised by a subsequent call or when the
+        writer context is exited.
+
+        .. note::
+
+            Rows for a component should either be added via `add_rows` or via `self.objects`,
+            but not both, because the order of the rows would be undetermined in background
+            mode.
+
+        :param component: Component name or table URL, as used for keys of `self.objects`.
+        :param batch_size: Number of rows to validate (and queue) at a time.
+        :raises ValueError: If a row does not conform to the table schema.
         """
-        self.write(zipped=self.cldf_spec.zipped, **self.objects)
+        self._raise_error()
+        if self.cldf_spec.background_validation and not self._worker:
+            self._queue = queue.Queue(maxsize=8)
+            self._worker = threading.Thread(target=self._work, daemon=True)
+            self._worker.start()
+        for batch in _batched(rows, batch_size):
+            if self._worker:
+                self._queue.put((component, batch))
+                self._raise_error()
+            else:
+                self.objects[component].extend(
+                    self._validated(component, batch, len(self.objects[component])))
 
     @staticmethod
     def _get_sources(
@@ -114,7 +466,13 @@ class CLDFWriter:
             args: argparse.Namespace,
             props: dict,
     ) -> list[dict]:
-        srcs = []
+        """
+        Collect JSON-LD descriptions of the repositories the data was derived from.
+
+        The descriptions - requiring `git` calls - are computed concurrently, and only once per
+        repository within a :func:`provenance_cache` context.
+        """
+        jobs = []
         # Let's see whether self.dataset is repository:
         if dataset:
             props.setdefault('rdf:ID', dataset.id)
@@ -123,26 +481,25 @@ class CLDFWriter:
             if dataset.repo:
                 if dataset.repo.url:
                     props.setdefault('dcat:accessURL', dataset.repo.url)
-                try:
-                    srcs.append(dataset.repo.json_ld())
-                except:  # pragma: no cover  # noqa: E722  # pylint: disable=W0702
-                    # If a git repository has no commit, git describe fails.
-                    pass
+                jobs.append((
+                    _provenance_key(dataset.repo),
+                    functools.partial(_dataset_repository_json_ld, dataset.repo)))
         if args:
             # We inspect the cli arguments to see whether some `Catalog`'s were used.
             for cat in vars(args).values():
                 if isinstance(cat, Catalog):
-                    srcs.append(cat.json_ld())
+                    jobs.append((_provenance_key(cat), cat.json_ld))
         # And check, whether any repositories have been "mounted" via git submodules in raw/:
         if dataset and dataset.raw_dir.exists():
             for p in dataset.raw_dir.iterdir():
                 if p.is_dir():
-                    try:
-                        repo = Repository(p)
-                    except ValueError:
-                        continue
-                    srcs.append(repo.json_ld())
-        return srcs
+                    jobs.append((
+                        ('Repository', str(p.resolve())),
+                        functools.partial(_repository_json_ld, p)))
+        if len(jobs) < 2:
+            return [src for src in (_cached_json_ld(*job) for job in jobs) if src]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(jobs), 8)) as executor:
+            return [src for src in executor.map(lambda job: _cached_json_ld(*job), jobs) if src]
 
     def write(self, **kw):
         """
@@ -157,8 +514,9 @@ class CLDFWriter:
                 ('dc:title', "python"),
                 ('dc:description', sys.version.split()[0])])]
         try:
-            self.cldf_spec.dir.joinpath('requirements.txt').write_text(
-                '\n'.join(iter_requirements()), encoding='utf8')
+            requirements = '\n'.join(iter_requirements())
+            with self._output(self.cldf_spec.dir / 'requirements.txt') as tmp:
+                tmp.write_text(requirements, encoding='utf8')
             reqs.append(
                 collections.OrderedDict([
                     ('dc:title', "python-packages"), ('dc:relation', 'requirements.txt')]))
@@ -166,7 +524,107 @@ class CLDFWriter:
             pass
 
         self.cldf.add_provenance(wasGeneratedBy=reqs)
-        self.cldf.write(**kw)
+        self._write_data(**kw)
+
+    @contextlib.contextmanager
+    def _output(self, target: pathlib.Path):
+        """
+        Context manager yielding the path of a temporary file to write the content of `target` to.
+        `target` is only replaced if the content changed, and only registered as output if
+        anything was written.
+        """
+        try:
+            previous = self._previous.get(target.relative_to(self.cldf_spec.dir).as_posix())
+        except ValueError:  # pragma: no cover
+            previous = None
+        with _replace_if_changed(target, previous) as tmp:
+            yield tmp
+            if tmp.exists():
+                self._outputs.add(target)
+
+    def _table_path(self, table_type: str, compressed: bool) -> pathlib.Path:
+        table = self.cldf[table_type]
+        res = pathlib.Path(table.url.resolve(table.base))
+        if compressed:
+            res = res.parent / f'{res.name}{COMPRESSION_SUFFIXES[self.cldf_spec.compression]}'
+        return res
+
+    def _write_table(self, table_type: str, items: Iterable[dict], compressed: bool) -> int:
+        """
+        Write the rows of a table to disk - compressing the data while writing if requested.
+
+        :return: Number of rows written.
+        """
+        table = self.cldf[table_type]
+        with self._output(self._table_path(table_type, compressed)) as tmp, \
+                contextlib.ExitStack() as stack:
+            if compressed:
+                fp = stack.enter_context(_compressed(
+                    tmp,
+                    pathlib.Path(table.url.resolve(table.base)).name,
+                    self.cldf_spec.compression,
+                    self.cldf_spec.compression_level))
+            else:
+                fp = stack.enter_context(tmp.open('wb'))
+            text = stack.enter_context(io.TextIOWrapper(
+                fp, encoding=table._get_dialect().python_encoding,  # pylint: disable=W0212
+                newline=''))
+            return table.write(items, fname=text)
+
+    def _write_sources(self, zipped: bool):
+        cldf = self.cldf
+        if cldf.sources and not cldf.properties.get('dc:source'):
+            cldf.properties['dc:source'] = 'sources.bib'
+        bib = cldf.bibpath
+        if not zipped:
+            with self._output(bib) as tmp:
+                cldf.sources.write(tmp)
+            return
+        with self._output(bib.parent / f'{bib.name}.zip') as tmp, \
+                tempfile.TemporaryDirectory() as d:
+            if cldf.sources.write(pathlib.Path(d) / bib.name):
+                with _compressed(tmp, bib.name, 'zip') as fp:
+                    fp.write(pathlib.Path(d).joinpath(bib.name).read_bytes())
+
+    def _write_data(self, zipped: Optional[Iterable[str]] = None, **table_items):
+        """
+        Mirrors `pycldf.Dataset.write`, but
+
+        - tables listed in `zipped` are compressed while writing, using the codec specified as \
+          `CLDFSpec.compression`,
+        - if `CLDFSpec.max_workers` is bigger than 1, each table is written in a separate worker \
+          process, while the sources are written by the main process, and
+        - files are only replaced if their content changed.
+
+        The metadata is written last, when the row counts of all tables are known.
+        """
+        global _WRITE_JOB  # pylint: disable=W0603
+        cldf, zipped = self.cldf, set(zipped or [])
+        compressed = {t for t in table_items if t in zipped or str(cldf[t].url) in zipped}
+        jobs = min(self.cldf_spec.max_workers, len(table_items))
+        if jobs > 1 and 'fork' not in multiprocessing.get_all_start_methods():  # pragma: no cover
+            jobs = 1
+
+        _WRITE_JOB = (self, table_items, compressed)
+        try:
+            with contextlib.ExitStack() as stack:
+                futures = {}
+                if jobs > 1:
+                    # Files written in worker processes must be registered in the main process:
+                    self._outputs.update(self._table_path(t, t in compressed) for t in table_items)
+                    executor = stack.enter_context(concurrent.futures.ProcessPoolExecutor(
+                        max_workers=jobs, mp_context=multiprocessing.get_context('fork')))
+                    futures = {t: executor.submit(_write_table_job, t) for t in table_items}
+                self._write_sources(
+                    cldf.properties.get('dc:source') in zipped or ('Source' in zipped))
+                for table_type in table_items:
+                    cldf[table_type].common_props['dc:extent'] = \
+                        futures[table_type].result() if futures else _write_table_job(table_type)
+        finally:
+            _WRITE_JOB = None
+        with self._output(self.cldf_spec.metadata_path) as tmp:
+            cldf.write_metadata(tmp)
+        return self.cldf_spec.metadata_path
 
 
 @dataclasses.dataclass
@@ -182,7 +640,19 @@ class CLDFSpec:
     important if multiple different CLDF datasets are created in the same directory).
     :ivar writer_cls: `CLDFWriter` subclass to use for writing the data.
     :ivar zipped: An `iterable` listing component names or csv file names for which the \
-    corresponding tables should be zipped.
+    corresponding tables should be compressed (while being written).
+    :ivar compression: Codec used to compress the tables listed in `zipped`, one of "zip", \
+    "gzip" (adding suffix ".gz") or "zstd" (adding suffix ".zst" and requiring the `zstandard` \
+    package before Python 3.14). Note that only zipped tables can be read with `pycldf`.
+    :ivar compression_level: Compression level passed to the codec or `None` for its default.
+    :ivar staged: Flag signaling whether `CLDFWriter` should write to a staging directory next \
+    to `dir`, which is swapped in for `dir` only after all data has been written successfully.
+    :ivar buffer_on_disk: Flag signaling whether rows added to `CLDFWriter.objects` should be \
+    buffered in temporary files rather than in memory (see :class:`DiskBuffer`).
+    :ivar background_validation: Flag signaling whether rows passed to `CLDFWriter.add_rows` \
+    should be validated in a background thread.
+    :ivar max_workers: If bigger than 1, the tables of the dataset are written in parallel by \
+    a pool of (forked) worker processes.
     """
     dir: pathlib.Path
     module: str = 'Generic'
@@ -191,12 +661,20 @@ class CLDFSpec:
     data_fnames: Optional[dict[str, str]] = dataclasses.field(default_factory=dict)
     writer_cls: type = CLDFWriter
     zipped: Union[set[str], list[str]] = dataclasses.field(default_factory=set)
+    compression: str = 'zip'
+    compression_level: Optional[int] = None
+    staged: bool = False
+    buffer_on_disk: bool = False
+    background_validation: bool = False
+    max_workers: int = 1
 
     def __post_init__(self):
         self.dir = pathlib.Path(self.dir)
         self.module = getattr(self.module, '__name__', self.module)
         if self.module not in {m.id for m in get_modules()}:
             raise ValueError(f'Invalid module: {self.module}')
+        if self.compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f'Invalid compression: {self.compression}')
 
         if self.default_metadata_path:
             self.default_metadata_path = pathlib.Path(self.default_metadata_path)
@@ -214,17 +692,105 @@ class CLDFSpec:
     def metadata_path(self) -> pathlib.Path:  # pylint: disable=C0116
         return (self.dir / self.metadata_fname) if self.dir else pathlib.Path(self.metadata_fname)
 
-    def make_clean(self):
-        """Clean out the cldf directory (typically preparing a new run of `makecldf`)."""
-        self.dir.mkdir(exist_ok=True)
-        for p in self.dir.iterdir():
-            if p.is_file() and p.name not in ['.gitattributes', 'README.md']:
-                p.unlink()
-        gitattributes = self.dir / '.gitattributes'
+    @property
+    def manifest_path(self) -> pathlib.Path:
+        """
+        Path of the manifest of inputs recorded by `cldfbench makecldf --incremental`.
+
+        Since the CLDF directory is typically published, the manifest is stored in the user's
+        cache directory, keyed by the path of the metadata file.
+        """
+        return cache_dir() / 'makecldf' / '{}.json'.format(
+            hashlib.md5(str(self.metadata_path.resolve()).encode('utf8')).hexdigest())
+
+    @staticmethod
+    def _add_gitattributes(d: pathlib.Path):
+        gitattributes = d / '.gitattributes'
         if not gitattributes.exists():
             with gitattributes.open('wt') as fp:
                 fp.write('*.csv text eol=crlf')
 
+    def make_clean(self, remove: bool = True) -> list[pathlib.Path]:
+        """
+        Clean out the cldf directory (typically preparing a new run of `makecldf`).
+
+        :param remove: If `False`, the files are not removed, but only determined.
+        :return: `list` of the files which have been - or would be - removed.
+        """
+        self.dir.mkdir(exist_ok=True)
+        res = [p for p in self.dir.iterdir() if p.is_file() and p.name not in KEEP_FILES]
+        if remove:
+            for p in res:
+                p.unlink()
+        self._add_gitattributes(self.dir)
+        return res
+
+    def make_staging_dir(self, clean: bool = True) -> pathlib.Path:
+        """
+        Create a sibling directory of the cldf directory, to write data to in staged mode.
+
+        Files which would be kept when cleaning the cldf directory - or all files, if `clean` is
+        `False` - are copied to the staging directory.
+        """
+        self.dir.parent.mkdir(parents=True, exist_ok=True)
+        res = pathlib.Path(
+            tempfile.mkdtemp(prefix=f'.{self.dir.name}.staged-', dir=self.dir.parent))
+        if self.dir.exists():
+            for p in self.dir.iterdir():
+                if p.is_file() and (p.name in KEEP_FILES or not clean):
+                    shutil.copy2(p, res / p.name)
+        self._add_gitattributes(res)
+        return res
+
+    def swap_in(self, staging: pathlib.Path):
+        """
+        Replace the cldf directory with a staging directory.
+
+        The cldf directory is renamed out of the way first. Then its subdirectories - which are \
+        never touched when cleaning the directory - are moved over to the staging directory, \
+        and the staging directory is renamed to take the place of the cldf directory. Since \
+        directories cannot be exchanged atomically, there is a short moment without cldf \
+        directory, but readers will never see partially written data.
+
+        If any of these steps fails, the moved subdirectories and the cldf directory are \
+        restored and the staging directory is removed. Only if restoring fails as well, the \
+        staging directory is kept, to not lose any content moved into it.
+        """
+        if not self.dir.exists():
+            try:
+                staging.rename(self.dir)
+            except BaseException:
+                shutil.rmtree(staging)
+                raise
+            return
+
+        old = staging.parent / f'{staging.name}.old'
+        try:
+            self.dir.rename(old)
+        except BaseException:
+            shutil.rmtree(staging)
+            raise
+
+        moved = []
+        try:
+            for p in old.iterdir():
+                if p.is_dir() and not staging.joinpath(p.name).exists():
+                    p.rename(staging / p.name)
+                    moved.append(p.name)
+            staging.rename(self.dir)
+        except BaseException as e:
+            try:
+                for name in moved:
+                    staging.joinpath(name).rename(old / name)
+                old.rename(self.dir)
+            except BaseException as ee:
+                raise RuntimeError(
+                    f'Could not swap in {staging} for {self.dir}, nor restore {self.dir} from '
+                    f'{old}. Both directories have been kept.') from ee
+            shutil.rmtree(staging)
+            raise e
+        shutil.rmtree(old)
+
     def copy_metadata(self):
         """Copy the default metadata to the location specified in spec."""
         shutil.copy(str(self.default_metadata_path), str(self.metadata_path))
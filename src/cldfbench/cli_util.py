@@ -4,6 +4,8 @@ Utilities used in cldfbench commands.
 import json
 import logging
 import pathlib
+import multiprocessing
+import concurrent.futures
 from typing import Union, Any, Optional
 from time import time
 import functools
@@ -21,7 +23,7 @@ from cldfbench.metadata import get_creators_and_contributors
 from .util import colored
 
 __all__ = ['DatasetNotFoundException',
-           'add_entry_point', 'add_dataset_spec', 'add_catalog_spec',
+           'add_entry_point', 'add_dataset_spec', 'add_catalog_spec', 'add_jobs_spec',
            'get_dataset', 'get_datasets', 'get_cldf_dataset',
            'with_dataset', 'with_datasets']
 
@@ -70,6 +72,17 @@ def add_dataset_spec(parser: argparse.ArgumentParser, ep: str = ENTRY_POINT, mul
             help="Interpret DATASET as simplified glob pattern relative to cwd.")
 
 
+def add_jobs_spec(parser: argparse.ArgumentParser):
+    """
+    Add an option to specify the number of worker processes used by :func:`with_datasets`.
+    """
+    parser.add_argument(
+        '--jobs',
+        help="Number of datasets to process in parallel",
+        type=int,
+        default=1)
+
+
 def get_dataset(args: argparse.Namespace) -> cldfbench.Dataset:
     """
     Get the `cldfbench.Dataset` specified by `args`.
@@ -170,15 +183,67 @@ def with_dataset(args: argparse.Namespace, func: Union[callable, str], dataset=N
     return res
 
 
+class _RecordCollector(logging.Handler):
+    """Collect log records, to be replayed in the parent process."""
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        if record.exc_info and not record.exc_text:
+            # Tracebacks cannot be pickled, so we render them now:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.getMessage(), None, None
+        self.records.append(record)
+
+
+# State shared with forked worker processes, to avoid pickling datasets, catalogs, etc.
+_JOB = None
+
+
+def _with_dataset_job(index: int) -> tuple[Any, list[logging.LogRecord]]:
+    args, func, datasets = _JOB
+    collector = _RecordCollector()
+    log = logging.getLogger(f'{__name__}.job{index}')
+    log.propagate = False
+    log.setLevel(logging.DEBUG)  # Filtering by level is done in the parent process.
+    log.addHandler(collector)
+    args.log = log
+    try:
+        return with_dataset(args, func, dataset=datasets[index]), collector.records
+    finally:
+        log.removeHandler(collector)
+
+
 def with_datasets(args, func):
     """
     Run `func` on all datasets specified by `args`.
 
+    If `args.jobs` is bigger than 1, datasets are processed by a pool of worker processes. Log
+    messages of each dataset are then replayed as one group, once the dataset is done.
+
     See :func:`with_dataset` for details.
     """
-    res = []
-    for ds in get_datasets(args):
-        res.append(with_dataset(args, func, dataset=ds))
+    global _JOB  # pylint: disable=W0603
+    datasets = get_datasets(args)
+    jobs = min(getattr(args, 'jobs', None) or 1, len(datasets))
+    if jobs > 1 and 'fork' not in multiprocessing.get_all_start_methods():  # pragma: no cover
+        args.log.warning('--jobs requires the "fork" start method, running serially')
+        jobs = 1
+    if jobs < 2:
+        return [with_dataset(args, func, dataset=ds) for ds in datasets]
+
+    res, log, _JOB = [], args.log, (args, func, datasets)
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=jobs, mp_context=multiprocessing.get_context('fork')) as executor:
+            for r, records in executor.map(_with_dataset_job, range(len(datasets))):
+                for record in records:
+                    if log.isEnabledFor(record.levelno):
+                        log.handle(record)
+                res.append(r)
+    finally:
+        _JOB = None
     return res
 
 
@@ -8,11 +8,12 @@ import dataclasses
 
 import pytest
 from cldfbench import Dataset
-from cldfbench.cli_util import add_dataset_spec, with_datasets
+from cldfbench.cli_util import add_dataset_spec, add_jobs_spec, with_datasets
 
 
 def register(parser):  # pylint: disable=C0116
     add_dataset_spec(parser, multiple=True)
+    add_jobs_spec(parser)
     parser.add_argument('--with-tests', action='store_true', default=False)
     parser.add_argument('--with-validation', action='store_true', default=False)
 
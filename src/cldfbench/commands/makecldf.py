@@ -24,6 +24,13 @@ def register(parser):  # pylint: disable=C0116
         help='Comma-separated list of communities to which the dataset should be submitted, '
              'passed through to "cldfbench zenodo"',
     )
+    parser.add_argument(
+        '--incremental',
+        help="Skip CLDF creation if none of the inputs (raw and etc data, dataset module, "
+             "catalog versions) changed since the last run with --incremental",
+        action='store_true',
+        default=False,
+    )
     add_dataset_spec(parser)
     add_catalog_spec(parser, 'glottolog')
 
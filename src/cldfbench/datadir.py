@@ -1,26 +1,35 @@
 """
 Functionality to access structured data in the file system.
 """
+import io
+import os
+import bz2
 import gzip
+import lzma
+import time
+import pickle
+import inspect
+import fnmatch
 import shutil
 import logging
+import tempfile
 from typing import Optional, Union, Literal
 import pathlib
 import zipfile
+import threading
 import functools
 import itertools
 import contextlib
+import dataclasses
+import http.client
+import urllib.parse
+import concurrent.futures
 from xml.etree import ElementTree as et
 import collections
-from collections.abc import Iterable
+from collections.abc import Iterable, Generator, Iterator
 import unicodedata
 import urllib.request
 
-try:
-    from odf.opendocument import load as load_odf
-except ImportError:  # pragma: no cover
-    load_odf = None
-
 try:
     import xlrd
 except ImportError:  # pragma: no cover
@@ -30,19 +39,33 @@ try:
 except ImportError:  # pragma: no cover
     openpyxl = None
 
-import simplepybtex.database
+import pycldf
+from simplepybtex.database import BibliographyData, BibliographyDataError
+from simplepybtex.errors import report_error
+from simplepybtex.database.input.bibtex import Parser as BibtexParser
 from csvw import dsv
 from clldutils.misc import xmlchars, slug
-from clldutils.path import TemporaryDirectory
+from clldutils.path import md5
 from clldutils import jsonlib
 from pycldf.sources import Source
 
-from .util import colored
+from .util import colored, cache_dir
+from ._compat import zstd
+from .table import Table
+from .lookup import Lookup
 
 
-__all__ = ['DataDir', 'urlopen']
+__all__ = ['DataDir', 'urlopen', 'DownloadResult']
 
 HTTP_REQUEST_TIMEOUT = 10
+USER_AGENT = 'cldfbench/2.0.0'
+CHUNK_SIZE = 1024 * 1024
+HTTP_VALIDATORS = '.http-validators.json'
+SPREADSHEET_CONVERSIONS = '.spreadsheet-conversions.json'
+# Increase, whenever the CSV output of the spreadsheet converters changes:
+SPREADSHEET_CONVERSIONS_VERSION = 2
+COMPRESSED_SUFFIXES = {'.zip', '.gz', '.bz2', '.xz', '.lzma', '.zst', '.zstd'}
+MAX_REDIRECTS = 5
 ODF_NS_TABLE = 'urn:oasis:names:tc:opendocument:xmlns:table:1.0'
 ODF_NS_TEXT = 'urn:oasis:names:tc:opendocument:xmlns:text:1.0'
 PathType = Union[str, pathlib.Path]
@@ -57,29 +80,148 @@ def _real_len(seq, pred=bool):
     return 0
 
 
-def _ods_value(cell):
-    return ' '.join(
-        str(e).strip()
-        for e in cell.childNodes
-        if e.qname == (ODF_NS_TEXT, 'p'))
+class _NormalizingReader(io.TextIOBase):
+    """
+    Wraps a text stream, normalizing the text line by line.
+
+    Since Unicode normalization never combines characters across line breaks, this yields the
+    same text as normalizing the full content at once.
+    """
+    def __init__(self, fp, form):
+        super().__init__()
+        self._fp = fp
+        self._norm = functools.partial(unicodedata.normalize, form)
+        self._buffer = ''
+
+    def readable(self):
+        return True
+
+    def _fill(self):
+        while '\n' not in self._buffer:
+            line = self._fp.readline()
+            if not line:
+                break
+            self._buffer += self._norm(line)
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            res, self._buffer = self._buffer + self._norm(self._fp.read()), ''
+            return res
+        while len(self._buffer) < size:
+            line = self._fp.readline()
+            if not line:
+                break
+            self._buffer += self._norm(line)
+        res, self._buffer = self._buffer[:size], self._buffer[size:]
+        return res
+
+    def readline(self, size=-1):
+        self._fill()
+        i = self._buffer.find('\n') + 1 or len(self._buffer)
+        if size is not None and 0 <= size < i:
+            i = size
+        res, self._buffer = self._buffer[:i], self._buffer[i:]
+        return res
+
+    def close(self):
+        self._fp.close()
+        super().close()
+
+
+class _XMLCharsReader:  # pylint: disable=R0903
+    """
+    Wraps a text stream, removing characters which are invalid in XML, and optionally wrapping the
+    content in a root element.
+    """
+    def __init__(self, fp, wrap: bool = False):
+        self._chunks = itertools.chain(
+            ['<r>'] if wrap else [],
+            iter(functools.partial(fp.read, CHUNK_SIZE), ''),
+            ['</r>'] if wrap else [])
+
+    def read(self, _=-1) -> str:  # pylint: disable=C0116
+        return xmlchars(next(self._chunks, ''))
+
+
+def _zip_member(zipf: zipfile.ZipFile, p: pathlib.Path, aname: Optional[str]) -> str:
+    """
+    The member of a zip archive to read: `aname` if specified, else a file named like the archive
+    without `.zip` suffix or the first file in the archive.
+    """
+    if aname:
+        return aname
+    names = [n for n in zipf.namelist() if not n.endswith('/')]
+    for name in names:
+        if pathlib.PurePosixPath(name).name == p.stem:
+            return name
+    return names[0]
+
+
+def _iter_bibtex_chunks(lines: Iterable[str]) -> Generator[str, None, None]:
+    """
+    Split BibTeX into chunks of complete entries, starting new chunks at lines starting with "@"
+    outside of braces.
+    """
+    chunk, depth = [], 0
+    for line in lines:
+        if depth == 0 and chunk and line.lstrip().startswith('@'):
+            yield ''.join(chunk)
+            chunk = []
+        chunk.append(line)
+        escaped = line.count('\\{') - line.count('\\}')
+        depth = max(depth + line.count('{') - line.count('}') - escaped, 0)
+    if chunk:
+        yield ''.join(chunk)
+
+
+def _normalized_rows(reader, normalize, dicts):
+    if not normalize:
+        yield from reader
+        return
+
+    norm = functools.partial(unicodedata.normalize, normalize)
+
+    if not dicts:
+        for row in reader:
+            yield [norm(k) for k in row]
+        return
+
+    for row in reader:
+        yield collections.OrderedDict([(k, norm(v)) for k, v in row.items()])
+
+
+def _excel_value(x):
+    if x is None:
+        return ""
+    if isinstance(x, float) and int(x) == x:
+        # Since Excel does not have an integer type, integers are rendered as "n.0",
+        # which in turn confuses type detection of tools like csvkit. Thus, we normalize
+        # numbers of the form "n.0" to "n".
+        return f'{int(x)}'  # pragma: no cover
+    return f'{x}'.strip()
 
 
-def _ods_cells(row):
-    cells = [
-        (
-            _ods_value(cell),
-            int(
-                cell.attributes.get((ODF_NS_TABLE, 'number-columns-repeated'))
-                or '1')
-        )
-        for cell in row.childNodes
-        if cell.qname == (ODF_NS_TABLE, 'table-cell')]
+def _write_xlsx_sheet(wb, sname: str, path: pathlib.Path):
+    ws, width = wb[sname], 0
+    if wb.read_only:
+        # In read-only mode, openpyxl trusts the dimension tag of the sheet, which is often wrong
+        # for files not written by Excel. So we determine the dimensions from the cells - which
+        # requires an additional pass over the rows - and pad rows to the full width ourselves.
+        ws.reset_dimensions()
+        width = max((len(row) for row in ws.iter_rows(values_only=True)), default=0)
+    with dsv.UnicodeWriter(path) as writer:
+        for row in ws.iter_rows(values_only=True):
+            writer.writerow(_pad_list([_excel_value(v) for v in row], width))
 
-    real_len = _real_len(cells, pred=lambda pair: bool(pair[0]))
-    return [
-        cloned_cell
-        for cell, number in itertools.islice(cells, real_len)
-        for cloned_cell in itertools.repeat(cell, number)]
+
+def _xlsx_sheet_to_csv(  # pragma: no cover
+        fname: pathlib.Path, sname: str, path: pathlib.Path, read_only=True):
+    """Convert one sheet of an XLSX file - to be run in a worker process."""
+    wb = openpyxl.load_workbook(str(fname), data_only=True, read_only=read_only)
+    try:
+        _write_xlsx_sheet(wb, sname, path)
+    finally:
+        wb.close()
 
 
 def _pad_list(li, length):
@@ -88,29 +230,242 @@ def _pad_list(li, length):
     return list(itertools.chain(li, itertools.repeat('', length - len(li))))
 
 
-def _ods_to_list(table):
-    rows = [
-        (
-            _ods_cells(row),
-            int(
-                row.attributes.get((ODF_NS_TABLE, 'number-rows-repeated'))
-                or '1')
-        )
-        for row in table.childNodes
-        if row.qname == (ODF_NS_TABLE, 'table-row')]
+def _iter_ods_rows(
+        fname: pathlib.Path,
+) -> Generator[tuple[str, Optional[list[str]], int], None, None]:
+    """
+    Parse the content of an OpenDocument spreadsheet incrementally.
+
+    :return: Generator of triples (table name, row, number of repetitions), where trailing empty \
+    cells are removed from rows. The end of a table is signaled by a row `None`.
+    """
+    def tag(ns, name):
+        return f'{{{ns}}}{name}'
+
+    with zipfile.ZipFile(str(fname)) as zipf, zipf.open('content.xml') as fp:
+        stack = []
+        for event, elem in et.iterparse(fp, ('start', 'end')):
+            if event == 'start':
+                stack.append(elem)
+                continue
+            stack.pop()
+            if elem.tag == tag(ODF_NS_TABLE, 'table-row') and stack \
+                    and stack[-1].tag == tag(ODF_NS_TABLE, 'table'):
+                cells = [
+                    (
+                        ' '.join(
+                            ''.join(e.itertext()).strip()
+                            for e in cell if e.tag == tag(ODF_NS_TEXT, 'p')),
+                        int(cell.get(tag(ODF_NS_TABLE, 'number-columns-repeated')) or '1'),
+                    )
+                    for cell in elem if cell.tag == tag(ODF_NS_TABLE, 'table-cell')]
+                yield (
+                    stack[-1].get(tag(ODF_NS_TABLE, 'name')),
+                    [
+                        cloned_cell
+                        for cell, number in itertools.islice(
+                            cells, _real_len(cells, pred=lambda pair: bool(pair[0])))
+                        for cloned_cell in itertools.repeat(cell, number)],
+                    int(elem.get(tag(ODF_NS_TABLE, 'number-rows-repeated')) or '1'),
+                )
+                # Free the memory of processed rows:
+                del stack[-1][-1]
+            elif elem.tag == tag(ODF_NS_TABLE, 'table'):
+                yield elem.get(tag(ODF_NS_TABLE, 'name')), None, 0
+                elem.clear()
+
 
-    real_len = _real_len(rows, pred=lambda pair: bool(pair[0]))
+def _part_path(p: pathlib.Path) -> pathlib.Path:
+    """Path to which an incomplete download of `p` is written."""
+    return p.parent / f'{p.name}.part'
 
-    max_width = max(len(row) for row, _ in rows)
-    rows = ((_pad_list(row, max_width), number) for row, number in rows)
-    return [
-        cloned_row
-        for row, number in itertools.islice(rows, real_len)
-        for cloned_row in itertools.repeat(row, number)]
+
+def _part_info_path(part: pathlib.Path) -> pathlib.Path:
+    """Path of the file recording where the data of a partial download `part` came from."""
+    return part.parent / f'{part.name}.json'
+
+
+def _range_headers(url: str, part: pathlib.Path) -> dict[str, str]:
+    """
+    HTTP headers to request the remainder of a partially downloaded file.
+
+    The request is conditional - via `If-Range` - on the data not having changed since the
+    partial download was started. Without a recorded validator, resuming is not safe, thus no
+    range is requested.
+    """
+    offset = part.stat().st_size if part.exists() else 0
+    info = _part_info_path(part)
+    info = jsonlib.load(info) if offset and info.exists() else {}
+    if info.get('url') != url or not info.get('validator'):
+        return {}
+    return {'Range': f'bytes={offset}-', 'If-Range': info['validator']}
+
+
+def _continues(res, part: pathlib.Path) -> bool:
+    """Whether a 206 response continues the partial download `part`, according to Content-Range."""
+    unit, _, spec = (res.headers.get('Content-Range') or '').strip().partition(' ')
+    start = spec.partition('-')[0]
+    offset = part.stat().st_size if part.exists() else 0
+    return unit == 'bytes' and start.isdigit() and int(start) == offset
+
+
+def _stream_to_file(url: str, res, part: pathlib.Path) -> int:
+    """
+    Write the body of an HTTP response to `part` in chunks - appending to the existing data for
+    a 206 response. If less data than announced in `Content-Length` is received,
+    `http.client.IncompleteRead` is raised.
+
+    When a new partial download is started, the validator of the response - a strong `ETag` or
+    the `Last-Modified` date - is recorded, to allow resuming the download safely.
+
+    :return: Number of bytes written.
+    """
+    append, info = res.status == 206, _part_info_path(part)
+    if not append:
+        etag = res.headers.get('ETag')
+        validator = etag if etag and not etag.startswith('W/') \
+            else res.headers.get('Last-Modified')
+        if validator:
+            jsonlib.dump(dict(url=url, validator=validator), info)
+        else:
+            info.unlink(missing_ok=True)
+    size = 0
+    with part.open('ab' if append else 'wb') as fp:
+        for chunk in iter(functools.partial(res.read, CHUNK_SIZE), b''):
+            fp.write(chunk)
+            size += len(chunk)
+    # Reading in chunks does not detect a connection closed prematurely:
+    expected = res.headers.get('Content-Length')
+    if expected and expected.isdigit() and size < int(expected):
+        raise http.client.IncompleteRead(b'', int(expected) - size)
+    return size
+
+
+def _finish_part(part: pathlib.Path, p: pathlib.Path):
+    """Move a complete download to its target path."""
+    part.replace(p)
+    _part_info_path(part).unlink(missing_ok=True)
+
+
+def _discard_part(part: pathlib.Path):
+    """Remove a partial download which cannot be continued."""
+    part.unlink(missing_ok=True)
+    _part_info_path(part).unlink(missing_ok=True)
+
+
+def _path_key(d: pathlib.Path, p: pathlib.Path) -> str:
+    """Identify `p` by its path relative to `d` if possible, by its absolute path otherwise."""
+    try:
+        return p.resolve().relative_to(d.resolve()).as_posix()
+    except ValueError:  # pragma: no cover
+        return str(p.resolve())
+
+
+class _Validators:
+    """
+    HTTP validators (i.e. `ETag` and `Last-Modified` headers) of downloaded URLs, persisted in a
+    JSON file.
+    """
+    def __init__(self, d: pathlib.Path):
+        self.d = d
+        self.path = d / HTTP_VALIDATORS
+        self._data = jsonlib.load(self.path) if self.path.exists() else {}
+        self._lock = threading.Lock()
+
+    def _key(self, p: pathlib.Path) -> str:
+        return _path_key(self.d, p)
+
+    def headers(self, url: str, p: pathlib.Path) -> dict[str, str]:
+        """Headers to make a request for `url` conditional on changes since `p` was downloaded."""
+        with self._lock:
+            v = self._data.get(url)
+        if not (v and p.exists() and v['path'] == self._key(p)):
+            return {}
+        res = {}
+        if v.get('etag'):
+            res['If-None-Match'] = v['etag']
+        if v.get('last_modified'):
+            res['If-Modified-Since'] = v['last_modified']
+        return res
+
+    def update(self, url: str, p: pathlib.Path, res):
+        """Record the validators sent with a response."""
+        etag, last_modified = res.headers.get('ETag'), res.headers.get('Last-Modified')
+        with self._lock:
+            if etag or last_modified:
+                self._data[url] = dict(path=self._key(p), etag=etag, last_modified=last_modified)
+            else:
+                self._data.pop(url, None)
+
+    def save(self):  # pylint: disable=C0116
+        with self._lock:
+            jsonlib.dump(self._data, self.path, indent=2, sort_keys=True)
+
+
+class _Conversions:
+    """
+    Record of spreadsheet conversions, i.e. of the checksum of a spreadsheet file and the paths
+    and checksums of the CSV files created from it, persisted in a JSON file.
+    """
+    def __init__(self, d: pathlib.Path):
+        self.d = d
+        self.path = d / SPREADSHEET_CONVERSIONS
+        self._data = jsonlib.load(self.path) if self.path.exists() else {}
+
+    def get(self, key: str, checksum: str, options: dict) -> Optional[PathDictType]:
+        """
+        Paths of the CSV files from a matching earlier conversion - by the same version of the
+        converters - if they still exist unchanged.
+        """
+        v = self._data.get(key)
+        if v and v.get('version') == SPREADSHEET_CONVERSIONS_VERSION \
+                and v['md5'] == checksum and v['options'] == options:
+            res = {name: self.d.joinpath(p) for name, p in v['paths'].items()}
+            if all(p.exists() and md5(p) == v['csv_md5'][name] for name, p in res.items()):
+                return res
+        return None
+
+    def update(self, key: str, checksum: str, options: dict, paths: PathDictType):
+        """Record a conversion."""
+        self._data[key] = dict(
+            version=SPREADSHEET_CONVERSIONS_VERSION,
+            md5=checksum,
+            options=options,
+            paths={name: _path_key(self.d, p) for name, p in paths.items()},
+            csv_md5={name: md5(p) for name, p in paths.items()})
+        jsonlib.dump(self._data, self.path, indent=2, sort_keys=True)
+
+
+def _cached_conversion(func):
+    """
+    Decorator for `DataDir` methods converting a spreadsheet to CSV.
+
+    The conversion is skipped if the spreadsheet file - and the conversion options - did not
+    change since it was last converted, and all CSV files created back then still exist.
+    """
+    sig = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kw):
+        args = sig.bind(self, *args, **kw)
+        args.apply_defaults()
+        fname = self._path(args.arguments['fname'])
+        options = {
+            k: sorted(v) if k == 'skip_sheets' else (
+                _path_key(self, v) if k == 'outdir' and v else v)
+            for k, v in args.arguments.items() if k not in {'self', 'fname', 'max_workers'}}
+        key, checksum = f'{func.__name__}:{_path_key(self, fname)}', md5(fname)
+        conversions = _Conversions(self)
+        res = conversions.get(key, checksum, options)
+        if res is None:
+            res = func(*args.args, **args.kwargs)
+            conversions.update(key, checksum, options, res)
+        return res
+    return wrapper
 
 
 @contextlib.contextmanager
-def urlopen(url, timeout=HTTP_REQUEST_TIMEOUT):
+def urlopen(url, timeout=HTTP_REQUEST_TIMEOUT, headers: Optional[dict[str, str]] = None):
     """
     Open URLs
     - without raising an exception on HTTP errors,
@@ -122,8 +477,85 @@ def urlopen(url, timeout=HTTP_REQUEST_TIMEOUT):
         http_response = https_response = lambda self, req, res: res  # pylint: disable=C3001
 
     opener = urllib.request.build_opener(NonRaisingHTTPErrorProcessor)
-    opener.addheaders = [('User-agent', 'cldfbench/2.0.0')]
-    yield opener.open(urllib.request.Request(url), timeout=timeout)
+    opener.addheaders = [('User-agent', USER_AGENT)]
+    yield opener.open(urllib.request.Request(url, headers=headers or {}), timeout=timeout)
+
+
+class _Session:
+    """
+    Persistent HTTP(S) connections, keyed by host - to be used by one thread only.
+    """
+    def __init__(self, timeout=HTTP_REQUEST_TIMEOUT):
+        self.timeout = timeout
+        self._connections = {}
+        self._last = None
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        if (scheme, netloc) not in self._connections:
+            cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            self._connections[scheme, netloc] = cls(netloc, timeout=self.timeout)
+        return self._connections[scheme, netloc]
+
+    def get(self, url: str, headers: Optional[dict[str, str]] = None) -> http.client.HTTPResponse:
+        """
+        Send a GET request, following redirects. The response must be read completely (or the
+        session closed) before the next request is made.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            u = urllib.parse.urlsplit(url)
+            if u.scheme not in ('http', 'https'):
+                raise ValueError(f'Unsupported URL: {url}')
+            conn, self._last = self._connection(u.scheme, u.netloc), (u.scheme, u.netloc)
+            path = (u.path or '/') + (f'?{u.query}' if u.query else '')
+            try:
+                conn.request('GET', path, headers=dict(headers or {}, **{'User-Agent': USER_AGENT}))
+                res = conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                # The connection may have been closed by the server - drop it and re-raise.
+                self.drop()
+                raise
+            location = res.getheader('Location')
+            if res.status not in (301, 302, 303, 307, 308) or not location:
+                return res
+            res.read()
+            url = urllib.parse.urljoin(url, location)
+        raise ValueError(f'Too many redirects: {url}')
+
+    def drop(self):
+        """
+        Close and discard the connection used for the last request, e.g. because reading the
+        response failed, leaving the connection in an unusable state.
+        """
+        conn = self._connections.pop(self._last, None)
+        if conn:
+            conn.close()
+
+    def close(self):  # pylint: disable=C0116
+        for conn in self._connections.values():
+            conn.close()
+        self._connections = {}
+
+
+@dataclasses.dataclass
+class DownloadResult:
+    """
+    Report about the download of one URL by :meth:`DataDir.download_many`.
+
+    :ivar status: HTTP status code of the last response, or `None`.
+    :ivar size: Size of the file at `path` in bytes.
+    :ivar attempts: Number of requests made.
+    :ivar error: Description of the error if the download failed, else `None`.
+    """
+    url: str
+    path: pathlib.Path
+    status: Optional[int] = None
+    size: int = 0
+    attempts: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:  # pylint: disable=C0116
+        return self.error is None
 
 
 class DataDir(type(pathlib.Path())):
@@ -157,21 +589,81 @@ class DataDir(type(pathlib.Path())):
         :param suffix: If `None`, suffix will be inferred from the path to be read. Otherwise \
         it can be used to force reading compressed content passing `.gz` or `.zip`.
         :param normalize: Any normalization form understood by `unicodedata.normalize`.
+
+        .. note::
+
+            Line endings of compressed content are returned unchanged, while they are translated
+            to `\\n` for uncompressed files.
+
+        .. seealso:: :meth:`open_text` to read large files in a streaming fashion.
+        """
+        newline = '' if (suffix or self._path(fname).suffix) in COMPRESSED_SUFFIXES else None
+        with self.open_text(
+                fname,
+                aname=aname,
+                normalize=normalize,
+                suffix=suffix,
+                encoding=encoding,
+                newline=newline) as fp:
+            return fp.read()
+
+    @contextlib.contextmanager
+    def open_text(  # pylint: disable=R0913,R0917
+            self,
+            fname: PathType,
+            aname: str = None,
+            normalize: Optional[Literal['NFC', 'NFKC', 'NFD', 'NFKD']] = None,
+            suffix: str = None,
+            encoding: str = 'utf8',
+            newline: Optional[str] = None,
+    ) -> Generator[io.TextIOBase, None, None]:
+        """
+        Context manager to open a - possibly compressed - file for reading text, decompressing
+        and decoding the content as it is read.
+
+        Supported compression formats are recognized by the suffixes `.zip`, `.gz`, `.bz2`, `.xz`
+        (or `.lzma`) and `.zst` (or `.zstd`, requiring the `zstandard` package before Python 3.14).
+
+        :param aname: "file in archive" name, if a file from a zip archive is to be read. \
+        Defaults to the file named like the archive without `.zip` suffix or the first file in \
+        the archive.
+        :param newline: Passed into `open`, e.g. `''` to read CSV data.
+
+        See :meth:`read` for a description of the other parameters.
         """
         p = self._path(fname)
         suffix = suffix or p.suffix
-        if suffix == '.zip':
-            with zipfile.ZipFile(str(p)) as zipf:
-                text = zipf.read(aname or zipf.namelist()[0]).decode(encoding)
-        elif suffix == '.gz':
-            with gzip.open(p) as fp:
-                text = fp.read().decode(encoding)
-        else:
-            text = p.read_text(encoding=encoding)
+        kw = dict(encoding=encoding, newline=newline)
+        with contextlib.ExitStack() as stack:
+            if suffix == '.zip':
+                zipf = stack.enter_context(zipfile.ZipFile(str(p)))
+                fp = io.TextIOWrapper(zipf.open(_zip_member(zipf, p, aname)), **kw)
+            elif suffix == '.gz':
+                fp = gzip.open(p, 'rt', **kw)
+            elif suffix == '.bz2':
+                fp = bz2.open(p, 'rt', **kw)
+            elif suffix in ('.xz', '.lzma'):
+                fp = lzma.open(p, 'rt', **kw)
+            elif suffix in ('.zst', '.zstd'):
+                if not zstd:  # pragma: no cover
+                    raise EnvironmentError(
+                        'Reading zstd compressed data requires the zstandard package\n'
+                        'pip install cldfbench[zstd]')
+                fp = zstd.open(p, 'rt', **kw)  # pragma: no cover
+            else:
+                fp = p.open(**kw)
+            fp = stack.enter_context(fp)
+            yield _NormalizingReader(fp, normalize) if normalize else fp
 
-        if normalize:
-            text = unicodedata.normalize(normalize, text)
-        return text
+    def iter_lines(self, fname: PathType, **kw) -> Iterator[str]:
+        """
+        Lazily read lines of text - without line endings - from a file.
+
+        Accepts the same keyword arguments as :meth:`open_text`.
+        """
+        with self.open_text(fname, **kw) as fp:
+            for line in fp:
+                yield line.rstrip('\r\n')
 
     def write(self, fname: PathType, text: str, encoding='utf8'):
         """
@@ -182,6 +674,33 @@ class DataDir(type(pathlib.Path())):
         self._path(fname).write_text(text, encoding=encoding)
         return fname
 
+    def iter_csv(
+            self,
+            fname: PathType,
+            normalize: Optional[Literal['NFC', 'NFKC', 'NFD', 'NFKD']] = None,
+            aname: Optional[str] = None,
+            suffix: Optional[str] = None,
+            **kw,
+    ) -> Generator[Union[dict[str, str], list[str]], None, None]:
+        """
+        Lazily read CSV data from a file, yielding one row at a time.
+
+        Accepts the same arguments as :meth:`read_csv`, but memory usage does not depend on the
+        size of the file.
+        """
+        p = self._path(fname)
+        if aname or (suffix or p.suffix) in COMPRESSED_SUFFIXES:
+            with self.open_text(
+                    p,
+                    aname=aname,
+                    suffix=suffix,
+                    encoding=kw.pop('encoding', 'utf-8-sig'),
+                    newline='',
+            ) as fp:
+                yield from _normalized_rows(dsv.reader(fp, **kw), normalize, kw.get('dicts'))
+            return
+        yield from _normalized_rows(dsv.reader(p, **kw), normalize, kw.get('dicts'))
+
     def read_csv(
             self,
             fname: PathType,
@@ -190,18 +709,51 @@ class DataDir(type(pathlib.Path())):
     ) -> list[Union[dict[str, str], list[str]]]:
         """
         Read CSV data from a file.
+
+        Compressed files are supported as described for :meth:`open_text`, with `aname` and \
+        `suffix` passed as keyword arguments.
+
+        .. seealso:: :meth:`iter_csv` to read large files row by row.
+        """
+        return list(self.iter_csv(fname, normalize=normalize, **kw))
+
+    def read_table(
+            self,
+            fname: PathType,
+            normalize: Optional[Literal['NFC', 'NFKC', 'NFD', 'NFKD']] = None,
+            **kw,
+    ) -> Table:
+        """
+        Read CSV data from a file into a column-oriented, dictionary-encoded
+        :class:`cldfbench.table.Table`, using the first row as header.
+
+        Accepts the same arguments as :meth:`read_csv` (except `dicts`).
+
+        .. code-block:: python
+
+            >>> languages = self.etc_dir.read_table('languages.csv')
+            >>> forms = self.raw_dir.read_table('forms.csv').join(
+            ...     languages, on='Language', right_on='Name', columns=['Glottocode'])
+            >>> for glottocode, rows in forms.filter(Glottocode=bool).groupby('Glottocode').items():
+            ...     pass
         """
-        reader = dsv.reader(self._path(fname), **kw)
+        kw.pop('dicts', None)
+        return Table.from_rows(self.iter_csv(fname, normalize=normalize, **kw))
 
-        if not normalize:
-            return list(reader)
+    def lookup(self, fname: PathType, key: str, value: Optional[str] = None) -> Lookup:
+        """
+        Get a read-only mapping of the values in column `key` of a CSV file to the rows - or to
+        the values in column `value` - of the file.
 
-        norm = functools.partial(unicodedata.normalize, normalize)
+        The keyed index is built only once, and persisted in the user's cache directory as
+        memory-mappable file, which is re-used until the CSV file changes. Thus, lookups are cheap
+        in repeated runs and can be shared by parallel workers.
 
-        if not kw.get('dicts'):
-            return [[norm(k) for k in row] for row in reader]
+        .. code-block:: python
 
-        return [collections.OrderedDict([(k, norm(v)) for k, v in row.items()]) for row in reader]
+            >>> concepts = self.etc_dir.lookup('concepts.csv', 'ENGLISH', 'CONCEPTICON_ID')
+        """
+        return Lookup.for_csv(self._path(fname), key, value=value)
 
     def write_csv(self, fname: PathType, rows: Iterable[list[str]], **kw):
         """
@@ -219,48 +771,151 @@ class DataDir(type(pathlib.Path())):
             xml = f'<r>{xml}</r>'
         return et.fromstring(xml.encode('utf8'))
 
+    def iter_xml(
+            self,
+            fname: PathType,
+            tag: Union[str, Iterable[str]],
+            wrap: bool = False,
+            **kw,
+    ) -> Generator[et.Element, None, None]:
+        """
+        Parse XML from a file incrementally, yielding the elements with matching tag.
+
+        Each element is yielded once it is complete, and is cleared and removed from the tree
+        afterwards - so elements must be processed (or copied) when they are yielded. Thus,
+        memory usage depends on the size of the matching elements rather than the size of the
+        file.
+
+        :param tag: Tag name (or iterable of tag names) of the elements to yield. Namespaced \
+        tags must be given in the form `{namespace}local`.
+        :param wrap: Flag signaling whether to wrap the content in a root element (e.g. to parse \
+        files with multiple top-level elements).
+        :param kw: Keyword arguments are passed into :meth:`open_text`.
+        """
+        tags = {tag} if isinstance(tag, str) else set(tag)
+        with self.open_text(fname, **kw) as fp:
+            stack = []
+            for event, elem in et.iterparse(_XMLCharsReader(fp, wrap=wrap), ('start', 'end')):
+                if event == 'start':
+                    stack.append(elem)
+                    continue
+                stack.pop()
+                if elem.tag in tags:
+                    yield elem
+                    elem.clear()
+                    if stack:
+                        # Since the parser reads ahead, `elem` need not be the last child of its
+                        # parent. But preceding matching siblings have been removed already.
+                        stack[-1].remove(elem)
+
     def read_json(self, fname: PathType, **_) -> Union[str, list, dict]:
         """Read a JSON file."""
         return jsonlib.load(self._path(fname))
 
-    def read_bib(self, fname: PathType = 'sources.bib') -> list[Source]:
-        """Read a BibTeX file."""
-        bib = simplepybtex.database.parse_string(self.read(fname), bib_format='bibtex')
-        return [Source.from_entry(k, e) for k, e in bib.entries.items()]
+    def iter_bib(
+            self,
+            fname: PathType = 'sources.bib',
+            cache: bool = False,
+    ) -> Generator[Source, None, None]:
+        """
+        Read a BibTeX file entry by entry.
+
+        :param cache: Flag signaling whether to cache the parsed sources in the user's cache \
+        directory, keyed by the md5 sum of the file. If the file is unchanged, sources are then \
+        loaded from the cache rather than parsed.
+        """
+        p = self._path(fname)
+        res, cached = None, None
+        if cache:
+            cached = cache_dir() / 'bib' / f'{md5(p)}-{pycldf.__version__}.pickle'
+            if cached.exists():
+                with cached.open('rb') as fp:
+                    for genre, id_, fields in pickle.load(fp):
+                        yield Source(genre, id_, fields, _check_id=False)
+                return
+            res = []
 
+        parser, keys = BibtexParser(), set()
+        with self.open_text(p) as fp:
+            for chunk in _iter_bibtex_chunks(fp):
+                # We reset the parsed data, but keep the parser - and thus @string macros:
+                parser.data = BibliographyData()
+                for key, entry in parser.parse_string(chunk).entries.items():
+                    # Since the parsed data is reset, we must check for duplicate keys - which
+                    # are case-insensitive in BibTeX - ourselves:
+                    if key.lower() in keys:
+                        report_error(BibliographyDataError(f'repeated bibliography entry: {key}'))
+                        continue  # pragma: no cover
+                    keys.add(key.lower())
+                    src = Source.from_entry(key, entry)
+                    if res is not None:
+                        res.append((src.genre, src.id, list(src.items())))
+                    yield src
+
+        if cached:
+            cached.parent.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=cached.parent, prefix=f'.{cached.name}.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as fp:
+                    pickle.dump(res, fp, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, cached)
+            finally:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)  # pragma: no cover
+
+    def read_bib(self, fname: PathType = 'sources.bib', cache: bool = False) -> list[Source]:
+        """Read a BibTeX file. See :meth:`iter_bib` for the `cache` option."""
+        return list(self.iter_bib(fname, cache=cache))
+
+    @_cached_conversion
     def ods2csv(self, fname: PathType, outdir: Optional[pathlib.Path] = None) -> PathDictType:
         """
         Dump the data from an OpenDocument Spreadsheet (suffix .ODS) file to CSV.
 
-        .. note::
+        If the spreadsheet did not change since it was last converted with the same options,
+        the paths of the existing CSV files are returned right away.
 
-            Requires `cldfbench` to be installed with extra "odf".
+        The spreadsheet content is parsed incrementally, twice: First to determine the extent of
+        the data in each table - i.e. ignoring trailing empty rows and columns - then to write
+        the rows.
         """
-        if not load_odf:  # pragma: no cover
-            raise EnvironmentError(
-                'ods2csv is only available when cldfbench is installed with odf support\n'
-                'pip install cldfbench[odf]')
-
         fname = self._path(fname)
-        ods_data = load_odf(fname)
-        tables = [
-            e for e in ods_data.spreadsheet.childNodes
-            if e.qname == (ODF_NS_TABLE, 'table')]
+        extent = collections.defaultdict(lambda: [0, 0, 0])  # [max width, rows, rows with data]
+        for table_name, row, number in _iter_ods_rows(fname):
+            if row is not None:
+                ext = extent[table_name]
+                ext[0] = max(ext[0], len(row))
+                ext[1] += number
+                if row:
+                    ext[2] = ext[1]
 
         outdir = outdir or self
-        res = {}
-        for table in tables:
-            table_name = table.attributes[ODF_NS_TABLE, 'name']
-            csv_path = outdir / f'{fname.stem}.{slug(table_name, lowercase=False)}.csv'
-            with dsv.UnicodeWriter(csv_path) as writer:
-                writer.writerows(_ods_to_list(table))
-            res[table_name] = csv_path
+        res, writer = {}, None
+        with contextlib.ExitStack() as stack:
+            written = 0
+            for table_name, row, number in _iter_ods_rows(fname):
+                if table_name not in res:
+                    res[table_name] = \
+                        outdir / f'{fname.stem}.{slug(table_name, lowercase=False)}.csv'
+                    writer = stack.enter_context(dsv.UnicodeWriter(res[table_name]))
+                    written = 0
+                if row is None:  # End of table.
+                    stack.close()
+                    continue
+                width, _, nrows = extent[table_name]
+                for _ in range(min(number, nrows - written)):
+                    writer.writerow(_pad_list(row, width))
+                    written += 1
         return res
 
+    @_cached_conversion
     def xls2csv(self, fname: PathType, outdir: Optional[pathlib.Path] = None) -> PathDictType:
         """
         Dump the data from an Excel XLS file to CSV.
 
+        If the spreadsheet did not change since it was last converted with the same options,
+        the paths of the existing CSV files are returned right away.
+
         .. note::
 
             Requires `cldfbench` to be installed with extra "excel".
@@ -288,10 +943,27 @@ class DataDir(type(pathlib.Path())):
                 res[sname] = path
         return res
 
-    def xlsx2csv(self, fname: PathType, outdir: Optional[pathlib.Path] = None) -> PathDictType:
+    @_cached_conversion
+    def xlsx2csv(  # pylint: disable=R0913,R0917
+            self,
+            fname: PathType,
+            outdir: Optional[pathlib.Path] = None,
+            read_only: bool = True,
+            skip_sheets: Iterable[str] = (),
+            max_workers: int = 1,
+    ) -> PathDictType:
         """
         Dump the data from an Excel XLSX file to CSV.
 
+        If the spreadsheet did not change since it was last converted with the same options,
+        the paths of the existing CSV files are returned right away.
+
+        :param read_only: Flag signaling whether to read the workbook in openpyxl's read-only \
+        mode, i.e. streaming rows rather than loading all cells into memory.
+        :param skip_sheets: Names of sheets which should not be converted.
+        :param max_workers: If bigger than 1, sheets are converted in parallel by a pool of \
+        worker processes.
+
         .. note::
 
             Requires `cldfbench` to be installed with extra "excel".
@@ -301,27 +973,36 @@ class DataDir(type(pathlib.Path())):
                 'xlsx2csv is only available when cldfbench is installed with excel support\n'
                 'pip install cldfbench[excel]')
 
-        def _excel_value(x):
-            if x is None:
-                return ""
-            if isinstance(x, float) and int(x) == x:
-                # Since Excel does not have an integer type, integers are rendered as "n.0",
-                # which in turn confuses type detection of tools like csvkit. Thus, we normalize
-                # numbers of the form "n.0" to "n".
-                return f'{int(x)}'  # pragma: no cover
-            return f'{x}'.strip()
-
         fname = self._path(fname)
-        res = {}
         outdir = outdir or self
-        wb = openpyxl.load_workbook(str(fname), data_only=True)
-        for sname in wb.sheetnames:
-            sheet = wb[sname]
-            path = outdir.joinpath(fname.stem + '.' + slug(sname, lowercase=False) + '.csv')
-            with dsv.UnicodeWriter(path) as writer:
-                for row in sheet.rows:
-                    writer.writerow([_excel_value(col.value) for col in row])
-            res[sname] = path
+
+        def paths(wb):
+            return {
+                sname: outdir.joinpath(fname.stem + '.' + slug(sname, lowercase=False) + '.csv')
+                for sname in wb.sheetnames if sname not in set(skip_sheets)}
+
+        if max_workers > 1:
+            # The workers load the workbook themselves, so we only read the sheet names here:
+            wb = openpyxl.load_workbook(str(fname), read_only=True)
+            try:
+                res = paths(wb)
+            finally:
+                wb.close()
+            if len(res) > 1:
+                with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    list(executor.map(
+                        functools.partial(_xlsx_sheet_to_csv, fname, read_only=read_only),
+                        res.keys(),
+                        res.values()))
+                return res
+
+        wb = openpyxl.load_workbook(str(fname), data_only=True, read_only=read_only)
+        try:
+            res = paths(wb)
+            for sname, path in res.items():
+                _write_xlsx_sheet(wb, sname, path)
+        finally:
+            wb.close()
         return res
 
     @contextlib.contextmanager
@@ -351,35 +1032,189 @@ class DataDir(type(pathlib.Path())):
             fname: PathType,
             log: LogType = None,
             skip_if_exists: bool = False,
+            revalidate: bool = False,
     ) -> pathlib.Path:
         """
         Download data from a URL to the directory.
+
+        Data is streamed to a file with suffix `.part` in chunks, which is renamed to the target
+        path once the download is complete. If such a partial file exists - e.g. because a
+        previous download was interrupted - only the missing data is requested using a HTTP
+        Range request, provided the data did not change since the partial download was started
+        (as determined by the `ETag` or `Last-Modified` header recorded back then). Otherwise,
+        the download starts over.
+
+        :param revalidate: If `True`, the `ETag` and `Last-Modified` headers of the response are \
+        recorded in a file `.http-validators.json` in the directory, and sent with subsequent \
+        requests for the same URL. If the server then signals that the data was not modified, \
+        the existing file is kept.
         """
         p = self._path(fname)
         if p.exists() and skip_if_exists:
             return p
 
-        with urlopen(url) as fp:
+        part = _part_path(p)
+        headers = _range_headers(url, part)
+        validators = _Validators(self) if revalidate else None
+        if validators and not headers:
+            headers = validators.headers(url, p)
+        with urlopen(url, headers=headers) as fp:
+            if part.exists() and (
+                    fp.status == 416 or (fp.status == 206 and not _continues(fp, part))):
+                # The partial download cannot be continued, so we start over.
+                _discard_part(part)
+                return self.download(url, fname, log=log, revalidate=revalidate)
             if log:
                 blue = functools.partial(colored, 'blue')
-                level = log.info if fp.status == 200 else log.warning
+                level = log.info if fp.status in (200, 206, 304) else log.warning
                 level(f'HTTP {blue(fp.status)} for {blue(url)}')
-            p.write_bytes(fp.read())
-
+            if fp.status == 304:
+                return p
+            _stream_to_file(url, fp, part)
+            if validators:
+                validators.update(url, p, fp)
+                validators.save()
+        _finish_part(part, p)
         return p
 
-    def download_and_unpack(self, url: str, *paths: str, **kw):
+    def download_many(  # pylint: disable=R0913,R0917
+            self,
+            urls_to_fnames: Union[dict[str, PathType], Iterable[tuple[str, PathType]]],
+            max_workers: int = 4,
+            retries: int = 3,
+            backoff: float = 1.0,
+            log: LogType = None,
+            skip_if_exists: bool = False,
+            revalidate: bool = False,
+    ) -> dict[str, DownloadResult]:
+        """
+        Download data from many URLs to the directory, using a pool of worker threads.
+
+        Each worker re-uses connections to the same host. Data is written to disk in chunks and
+        only moved to the target path when complete; interrupted downloads are resumed as
+        described for :meth:`download`. Requests failing with connection errors or server errors
+        (HTTP status 429 or 5xx) are retried up to `retries` times, waiting `backoff * 2 ** n`
+        seconds before the n-th retry.
+
+        See :meth:`download` for the `revalidate` option.
+
+        :param urls_to_fnames: Mapping of URLs to target filenames (or iterable of pairs).
+        :return: `dict` mapping URLs to :class:`DownloadResult` objects.
+        """
+        items = urls_to_fnames.items() if isinstance(urls_to_fnames, dict) else urls_to_fnames
+        results = {url: DownloadResult(url=url, path=self._path(fname)) for url, fname in items}
+        local = threading.local()
+        sessions = []
+        validators = _Validators(self) if revalidate else None
+
+        def fetch(res: DownloadResult):
+            if skip_if_exists and res.path.exists():
+                res.status, res.size = None, res.path.stat().st_size
+                return res
+            if not hasattr(local, 'session'):
+                local.session = _Session()
+                sessions.append(local.session)
+            part = _part_path(res.path)
+            while True:
+                res.attempts += 1
+                try:
+                    headers = _range_headers(res.url, part)
+                    if validators and not headers:
+                        headers = validators.headers(res.url, res.path)
+                    resp = local.session.get(res.url, headers=headers)
+                    res.status, res.error = resp.status, None
+                    if resp.status == 200 or (resp.status == 206 and _continues(resp, part)):
+                        _stream_to_file(res.url, resp, part)
+                        if validators:
+                            validators.update(res.url, res.path, resp)
+                        _finish_part(part, res.path)
+                        res.size = res.path.stat().st_size
+                        break
+                    resp.read()
+                    if resp.status == 304:
+                        res.size = res.path.stat().st_size
+                        break
+                    if resp.status in (206, 416) and part.exists():
+                        # The partial download cannot be continued, so we start over.
+                        _discard_part(part)
+                        continue
+                    res.error = f'HTTP {resp.status}'
+                    if resp.status != 429 and resp.status < 500:
+                        break
+                except (http.client.HTTPException, OSError) as e:
+                    # If reading the response failed, the connection is in an unusable state:
+                    local.session.drop()
+                    res.error = f'{e.__class__.__name__}: {e}'
+                except ValueError as e:
+                    res.error = str(e)
+                    break
+                if res.attempts > retries:
+                    break
+                time.sleep(backoff * 2 ** (res.attempts - 1))
+            if log:
+                blue = functools.partial(colored, 'blue')
+                (log.info if res.ok else log.warning)(
+                    f'HTTP {blue(res.status)} for {blue(res.url)}'
+                    + ('' if res.ok else f': {res.error}'))
+            return res
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(fetch, results.values()))
+        finally:
+            for session in sessions:
+                session.close()
+            if validators:
+                validators.save()
+        return results
+
+    def download_and_unpack(
+            self,
+            url: str,
+            *paths: str,
+            log: LogType = None,
+            max_workers: int = 4,
+            **_,
+    ) -> list[pathlib.Path]:
         """
         Download a zipfile and immediately unpack selected content.
 
+        Selected members are streamed from the archive straight into the directory, by a pool of
+        worker threads. Note that the directory structure within the archive is not preserved.
+        If several selected members have the same name, they are unpacked one after the other, so
+        the last one wins.
+
         :param url: URL from where to download the archive.
-        :param paths: Path names to be compared to `ZipInfo.filename`.
-        :param kw:
-        """
-        with self.temp_download(url, 'ds.zip', log=kw.pop('log', None)) as zipp:
-            with TemporaryDirectory() as tmpdir:
-                with zipfile.ZipFile(str(zipp)) as zipf:
-                    for info in zipf.infolist():
-                        if (not paths) or info.filename in paths:
-                            zipf.extract(info, path=str(tmpdir))
-                            shutil.copy(str(tmpdir.joinpath(info.filename)), str(self))
+        :param paths: Path names or glob patterns (as understood by `fnmatch`) to be compared to \
+        `ZipInfo.filename`. If no paths are given, all files in the archive are unpacked.
+        :return: List of paths of the unpacked files.
+        """
+        local = threading.local()
+        zips = []
+
+        def unpack(zipp, info):
+            if not hasattr(local, 'zipf'):
+                local.zipf = zipfile.ZipFile(str(zipp))
+                zips.append(local.zipf)
+            target = self / pathlib.PurePosixPath(info.filename).name
+            with local.zipf.open(info) as src, target.open('wb') as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            return target
+
+        with self.temp_download(url, 'ds.zip', log=log) as zipp:
+            with zipfile.ZipFile(str(zipp)) as zipf:
+                infos = [
+                    info for info in zipf.infolist() if (not info.is_dir()) and (
+                        (not paths) or any(
+                            info.filename == p or fnmatch.fnmatchcase(info.filename, p)
+                            for p in paths))]
+            names = [pathlib.PurePosixPath(info.filename).name for info in infos]
+            if len(set(names)) < len(names):
+                # Members with the same name must not be written concurrently:
+                max_workers = 1
+            try:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    return list(executor.map(functools.partial(unpack, zipp), infos))
+            finally:
+                for zipf in zips:
+                    zipf.close()
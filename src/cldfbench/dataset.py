@@ -2,6 +2,8 @@
 A cldfbench Dataset provides scaffolding to automatically create one or more CLDF Datasets.
 """
 import sys
+import json
+import hashlib
 from typing import Union, Optional
 import inspect
 import pathlib
@@ -13,20 +15,23 @@ import subprocess
 from collections.abc import Generator
 
 import pycldf
-from clldutils.path import sys_path
+from clldutils.path import sys_path, walk, md5
 from clldutils.misc import nfilter
+from clldutils import jsonlib
 from cldfcatalog import Repository
 
-from cldfbench.cldf import CLDFSpec, CLDFWriter
+from cldfbench.cldf import CLDFSpec, CLDFWriter, provenance_cache
+from cldfbench.catalogs import Catalog
 from cldfbench.datadir import DataDir
 from cldfbench.metadata import Metadata
 from cldfbench.ci import build_status_badge
-from cldfbench.util import get_entrypoints
+from cldfbench.util import get_entrypoints, cache_dir
 from cldfbench._compat import utcnow
 
 __all__ = ['iter_datasets', 'get_dataset', 'get_datasets', 'Dataset', 'ENTRY_POINT']
 ENTRY_POINT = 'cldfbench.dataset'
 NOOP = -1
+DATASET_INDEX = 'dataset_index.json'
 PathType = Union[str, pathlib.Path]
 SpecDictKeyType = Union[str, None]
 SpecDictType = dict[SpecDictKeyType, CLDFSpec]
@@ -211,15 +216,69 @@ class Dataset:
         """
         return self.metadata.markdown() if self.metadata else ''
 
+    def _makecldf_manifest(self, cldf_spec: CLDFSpec, args: argparse.Namespace) -> dict:
+        """
+        Compute a manifest of all inputs which may influence the CLDF data created by
+        `cmd_makecldf` for `cldf_spec`.
+        """
+        def files(d):
+            if not d.exists():
+                return {}
+            return {
+                p.relative_to(d).as_posix(): md5(p) for p in sorted(walk(d, mode='files'))
+                if '.git' not in p.relative_to(d).parts}
+
+        catalogs = {}
+        for cat in vars(args).values():
+            if isinstance(cat, Catalog):
+                catalogs[cat.cli_name()] = cat.describe() if cat.repo else str(cat.dir)
+        md = self.dir / 'metadata.json'
+        return {
+            'module': md5(inspect.getfile(self.__class__)),
+            'metadata': md5(md) if md.exists() else None,
+            'raw': files(self.raw_dir),
+            'etc': files(self.etc_dir),
+            'catalogs': catalogs,
+            'cldf_spec': {
+                'module': cldf_spec.module,
+                'default_metadata': md5(cldf_spec.default_metadata_path),
+                'metadata_fname': cldf_spec.metadata_fname,
+                'data_fnames': cldf_spec.data_fnames,
+                'zipped': sorted(cldf_spec.zipped),
+                'compression': [cldf_spec.compression, cldf_spec.compression_level],
+            },
+        }
+
     def _cmd_makecldf(self, args):
         specs = list(self.cldf_specs_dict.values())
-        if len(specs) == 1:
-            # There's only one CLDF spec! We instantiate the writer now and inject it into `args`:
-            with self.cldf_writer(args, cldf_spec=specs[0]) as writer:
-                args.writer = writer
+        incremental = getattr(args, 'incremental', False)
+        if incremental and all(
+                spec.metadata_path.exists()
+                and spec.manifest_path.exists()
+                and jsonlib.load(spec.manifest_path) == self._makecldf_manifest(spec, args)
+                for spec in specs):
+            args.log.info('inputs of %s unchanged, skipping makecldf', self.id)
+            return NOOP
+        for spec in specs:
+            # The CLDF data is about to change - and may not be completed:
+            spec.manifest_path.unlink(missing_ok=True)
+
+        with provenance_cache():
+            if len(specs) == 1:
+                # There's only one CLDF spec! We instantiate the writer now and inject it into
+                # `args`:
+                with self.cldf_writer(args, cldf_spec=specs[0]) as writer:
+                    args.writer = writer
+                    self.cmd_makecldf(args)
+            else:
                 self.cmd_makecldf(args)
-        else:
-            self.cmd_makecldf(args)
+
+        if incremental:
+            # We compute the manifests after the run, so that changes to the inputs made by
+            # `cmd_makecldf` itself - e.g. spreadsheets converted to CSV in `raw/` - are recorded.
+            for spec in specs:
+                spec.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+                jsonlib.dump(self._makecldf_manifest(spec, args), spec.manifest_path, indent=4)
 
         if self.metadata and self.metadata.known_license:
             legalcode = self.metadata.known_license.legalcode
@@ -237,18 +296,65 @@ class Dataset:
         return NOOP
 
 
+def _iter_datasets(eps) -> Generator[tuple[importlib.metadata.EntryPoint, Dataset], None, None]:
+    for p in eps:
+        try:
+            cls = p.load()
+            yield p, cls()  # yield an initialized `Dataset` object.
+        except ImportError as e:  # pragma: no cover
+            logging.getLogger('cldfbench').warning('Error importing %s: %s', p.name, e)
+
+
 def iter_datasets(ep: str = ENTRY_POINT) -> Generator[Dataset, None, None]:
     """
     Yields `Dataset` instances registered for the specified entry point.
 
     :param ep: Name of the entry point.
     """
-    for p in get_entrypoints(ep):
+    for _, ds in _iter_datasets(get_entrypoints(ep)):
+        yield ds
+
+
+def _dataset_index(
+        ep: str,
+        refresh: bool = False,
+) -> tuple[dict[str, str], list[importlib.metadata.EntryPoint]]:
+    """
+    Mapping of dataset IDs to names of entry points, cached in the user's cache directory.
+
+    Since the cache directory is shared by all Python environments of the user, indexes are
+    stored per environment (i.e. per `sys.prefix`). An index is rebuilt - i.e. all datasets are
+    loaded - whenever the list of entry points or the versions of the distributions providing
+    them changed.
+    """
+    eps = list(get_entrypoints(ep))
+    key = hashlib.md5(json.dumps(sorted(
+        [f'{p.name}', f'{p.value}', f'{getattr(getattr(p, "dist", None), "version", None)}']
+        for p in eps)).encode('utf8')).hexdigest()
+    fname = cache_dir() / DATASET_INDEX
+    try:
+        index = jsonlib.load(fname) if fname.exists() else {}
+    except ValueError:  # pragma: no cover
+        index = {}
+    entries = index.setdefault(sys.prefix, {})
+    if refresh or entries.get(ep, {}).get('key') != key:
+        datasets = {}
+        for p, ds in _iter_datasets(eps):
+            datasets.setdefault(f'{ds.id}', f'{p.name}')
+        entries[ep] = {'key': key, 'datasets': datasets}
         try:
-            cls = p.load()
-            yield cls()  # yield an initialized `Dataset` object.
-        except ImportError as e:  # pragma: no cover
-            logging.getLogger('cldfbench').warning('Error importing %s: %s', p.name, e)
+            jsonlib.dump(index, fname, indent=2)
+        except OSError:  # pragma: no cover
+            pass
+    return entries[ep]['datasets'], eps
+
+
+def _dataset_from_index(spec, index, eps) -> Optional[Dataset]:
+    if f'{spec}' in index:
+        for _, ds in _iter_datasets(p for p in eps if f'{p.name}' == index[f'{spec}']):
+            if ds.id == spec:
+                return ds
+    return None
 
 
 def get_dataset(spec, ep: str = ENTRY_POINT) -> Optional[Dataset]:
@@ -257,19 +363,25 @@ def get_dataset(spec, ep: str = ENTRY_POINT) -> Optional[Dataset]:
 
     :param spec: Specification of the dataset, either an ID or a path to a Python module \
     containing a subclass of :class:`Dataset`.
+
+    .. note::
+
+        Lookup of installed datasets by ID uses an index cached in the user's cache directory,
+        so only the matching dataset has to be imported.
     """
-    # First assume `spec` is the ID of an installed dataset:
-    # iterate over registered entry points
-    for ds in iter_datasets(ep=ep):
-        if ds.id == spec:
-            return ds
+    # First assume `spec` is the ID of an installed dataset and look it up in the index:
+    ds = _dataset_from_index(spec, *_dataset_index(ep))
+    if ds:
+        return ds
 
     # Then check whether `spec` points to a python module:
     # `Dataset` subclass found in the module:
     ds = dataset_from_module(spec)
     if ds:
         return ds
-    return None
+
+    # Finally, make sure a stale index is not hiding an installed dataset:
+    return _dataset_from_index(spec, *_dataset_index(ep, refresh=True))
 
 
 def get_datasets(spec, ep=ENTRY_POINT, glob: bool = False) -> list[Dataset]:
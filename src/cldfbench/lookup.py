@@ -0,0 +1,227 @@
+"""
+Persistent, memory-mapped indexes of CSV tables - typically the mappings in a dataset's `etc/`
+directory - keyed by the values of one column.
+
+An index file is laid out as follows (all numbers little-endian):
+
+- a fixed-size header (see `HEADER`): magic bytes, modification time, size and md5 checksum of
+  the indexed CSV file, and the length of
+- JSON encoded metadata (column names, key column, number of rows and of distinct strings),
+- the offsets of the distinct strings in
+- the UTF-8 encoded, concatenated distinct strings,
+- the rows, each as sequence of codes, i.e. indices of strings,
+- the row indices, sorted by key.
+
+Thus, the index is dictionary-encoded, and lookups are binary searches on the memory-mapped
+file, which can be shared between processes without copying.
+"""
+import os
+import json
+import mmap
+import array
+import struct
+import hashlib
+import pathlib
+import tempfile
+from collections.abc import Mapping, Iterator, Iterable
+from typing import Optional, Union
+
+from csvw import dsv
+from clldutils.path import md5
+
+from .util import cache_dir
+
+__all__ = ['Lookup']
+
+MAGIC = b'CLDFBLK1'
+HEADER = struct.Struct('<8sqQ16sQ')  # magic, mtime_ns, size, md5 digest, length of metadata
+ALIGN = 8
+
+
+def _padding(n: int) -> bytes:
+    return b'\x00' * (-n % ALIGN)
+
+
+def _write_index(src: pathlib.Path, dest: pathlib.Path, key: str, checksum: str):
+    """Read the CSV file `src` and write its index keyed by column `key` to `dest`."""
+    strings, codes, rows = {}, array.array('I'), 0
+    reader = dsv.reader(src)
+    columns = next(reader, [])
+    if key not in columns:
+        raise KeyError(f'{src} has no column {key}')
+    for row in reader:
+        for i, _ in enumerate(columns):
+            codes.append(strings.setdefault(row[i] if i < len(row) else '', len(strings)))
+        rows += 1
+
+    encoded = [s.encode('utf8') for s in strings]
+    offsets, offset = array.array('Q', [0]), 0
+    for s in encoded:
+        offset += len(s)
+        offsets.append(offset)
+    kcol, ncols = columns.index(key), len(columns)
+    order = array.array('I', sorted(range(rows), key=lambda r: encoded[codes[r * ncols + kcol]]))
+    for a, b in zip(order, order[1:]):
+        if codes[a * ncols + kcol] == codes[b * ncols + kcol]:
+            raise ValueError(
+                f'Values in column {key} of {src} are not unique: '
+                f'{encoded[codes[a * ncols + kcol]].decode("utf8")}')
+
+    meta = json.dumps(dict(columns=columns, key=key, rows=rows, strings=len(encoded))).encode()
+    stat = src.stat()
+    # Processes building the same index concurrently must not write to the same temporary file:
+    fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=f'.{dest.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(HEADER.pack(
+                MAGIC, stat.st_mtime_ns, stat.st_size, bytes.fromhex(checksum), len(meta)))
+            fp.write(meta + _padding(len(meta)))
+            fp.write(offsets.tobytes())
+            fp.write(b''.join(encoded) + _padding(offset))
+            fp.write(codes.tobytes() + _padding(len(codes) * codes.itemsize))
+            fp.write(order.tobytes())
+        os.replace(tmp, dest)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)  # pragma: no cover
+
+
+def _read_header(p: pathlib.Path) -> Optional[tuple]:
+    try:
+        with p.open('rb') as fp:
+            header = HEADER.unpack(fp.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+    return header if header[0] == MAGIC else None
+
+
+class Lookup(Mapping):
+    """
+    A read-only mapping of the values in the key column of a CSV table to the rows of the table.
+
+    Rows are returned as `dict`s or - if `value` is specified - as the value of a single column.
+
+    .. code-block:: python
+
+        >>> glottocodes = Lookup.for_csv(self.etc_dir / 'languages.csv', 'Name', 'Glottocode')
+        >>> glottocodes['English']
+        'stan1293'
+    """
+    def __init__(self, path: pathlib.Path, value: Optional[str] = None):
+        self.path = path
+        with path.open('rb') as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buf = buf = memoryview(self._mmap)
+        offset = HEADER.size
+        meta_length = HEADER.unpack_from(buf)[-1]
+        meta = json.loads(bytes(buf[offset:offset + meta_length]))
+        offset += meta_length + len(_padding(meta_length))
+        self.columns, self.key = meta['columns'], meta['key']
+        self._rows, self._ncols = meta['rows'], len(self.columns)
+        self._kcol = self.columns.index(self.key)
+        self._value = None if value is None else self.columns.index(value)
+
+        def section(length, fmt=None):
+            nonlocal offset
+            res = buf[offset:offset + length]
+            offset += length + len(_padding(length))
+            if fmt:
+                with res:
+                    return res.cast(fmt)
+            return res
+
+        self._offsets = section((meta['strings'] + 1) * 8, 'Q')
+        self._strings = section(self._offsets[-1])
+        self._codes = section(self._rows * self._ncols * 4, 'I')
+        self._order = section(self._rows * 4, 'I')
+
+    @classmethod
+    def for_csv(
+            cls,
+            fname: Union[str, pathlib.Path],
+            key: str,
+            value: Optional[str] = None,
+            index_dir: Optional[pathlib.Path] = None,
+    ) -> 'Lookup':
+        """
+        Get a lookup for a CSV file, (re-)building its index if necessary.
+
+        The index is stored in the user's cache directory - or `index_dir` - and is rebuilt if
+        the modification time or size of the CSV file changed and its md5 checksum changed too.
+        """
+        src = pathlib.Path(fname).resolve()
+        index_dir = index_dir or cache_dir() / 'lookup'
+        index_dir.mkdir(parents=True, exist_ok=True)
+        p = index_dir / '{}.idx'.format(
+            hashlib.md5(json.dumps([str(src), key]).encode('utf8')).hexdigest())
+
+        stat, header = src.stat(), _read_header(p)
+        if not (header and header[1:3] == (stat.st_mtime_ns, stat.st_size)):
+            checksum = md5(src)
+            if header and header[3].hex() == checksum:
+                # Same content, so we only update the recorded stats of the CSV file:
+                with p.open('r+b') as fp:
+                    fp.write(HEADER.pack(
+                        MAGIC, stat.st_mtime_ns, stat.st_size, header[3], header[4]))
+            else:
+                _write_index(src, p, key, checksum)
+        return cls(p, value=value)
+
+    def close(self):
+        for attr in ['_offsets', '_strings', '_codes', '_order', '_buf']:
+            getattr(self, attr).release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _bytes(self, code: int) -> bytes:
+        return bytes(self._strings[self._offsets[code]:self._offsets[code + 1]])
+
+    def _string(self, code: int) -> str:
+        return self._bytes(code).decode('utf8')
+
+    def _key_bytes(self, row: int) -> bytes:
+        return self._bytes(self._codes[row * self._ncols + self._kcol])
+
+    def _row(self, row: int) -> Union[str, dict[str, str]]:
+        if self._value is not None:
+            return self._string(self._codes[row * self._ncols + self._value])
+        codes = self._codes[row * self._ncols:(row + 1) * self._ncols]
+        return {name: self._string(code) for name, code in zip(self.columns, codes)}
+
+    def _find(self, key: str) -> Optional[int]:
+        target, lo, hi = key.encode('utf8'), 0, self._rows
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_bytes(self._order[mid]) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._rows and self._key_bytes(self._order[lo]) == target:
+            return self._order[lo]
+        return None
+
+    def __getitem__(self, key: str) -> Union[str, dict[str, str]]:
+        row = self._find(key) if isinstance(key, str) else None
+        if row is None:
+            raise KeyError(key)
+        return self._row(row)
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self._find(key) is not None
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the keys in the order of the rows in the CSV file."""
+        for row in range(self._rows):
+            yield self._key_bytes(row).decode('utf8')
+
+    def rows(self) -> Iterable[Union[str, dict[str, str]]]:
+        """The rows, in the order of the CSV file."""
+        return (self._row(row) for row in range(self._rows))
@@ -0,0 +1,247 @@
+"""
+A compact, column-oriented in-memory representation of tabular raw data.
+
+Columns of a :class:`Table` are dictionary-encoded, i.e. each distinct value is stored only once,
+and rows refer to values by integer code. Thus, operations like filtering or joining need to
+evaluate conditions only once per distinct value, rather than once per row.
+"""
+import array
+import itertools
+import collections
+from collections.abc import Iterable, Callable, Collection, Iterator
+from typing import Optional, Union, Literal
+
+__all__ = ['Column', 'Table']
+
+ConditionType = Union[str, Collection[str], Callable[[str], bool]]
+
+
+class Column:
+    """
+    A dictionary-encoded column of string values.
+
+    :ivar categories: `list` of the distinct values in the column.
+    :ivar codes: `array.array` of indices into `categories`, one per row.
+    """
+    def __init__(
+            self,
+            categories: Optional[list[str]] = None,
+            codes: Optional[array.array] = None,
+            _index: Optional[dict[str, int]] = None,
+    ):
+        self.categories = categories if categories is not None else []
+        self.codes = codes if codes is not None else array.array('I')
+        self._index = _index if _index is not None else {
+            v: i for i, v in enumerate(self.categories)}
+
+    def append(self, value: str):
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.categories)
+            self.categories.append(value)
+        self.codes.append(code)
+
+    def code(self, value: str) -> Optional[int]:
+        """The code of `value` or `None`, if `value` does not appear in the column."""
+        return self._index.get(value)
+
+    def matching_codes(self, condition: ConditionType) -> set[int]:
+        """
+        Codes of the values satisfying a condition.
+
+        :param condition: A value to compare with, a collection of values to check membership \
+        in, or a callable accepting a value and returning a `bool`.
+        """
+        if callable(condition):
+            return {i for i, v in enumerate(self.categories) if condition(v)}
+        if isinstance(condition, str):
+            condition = [condition]
+        return {self._index[v] for v in condition if v in self._index}
+
+    def take(self, indices: Iterable[int]) -> 'Column':
+        """A new column with the values of the selected rows, sharing the categories."""
+        codes = self.codes
+        return Column(
+            self.categories, array.array('I', (codes[i] for i in indices)), _index=self._index)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> str:
+        return self.categories[self.codes[i]]
+
+    def __iter__(self) -> Iterator[str]:
+        categories = self.categories
+        return (categories[c] for c in self.codes)
+
+
+class Table:
+    """
+    A table of string data, stored as mapping of column names to :class:`Column` objects.
+
+    .. code-block:: python
+
+        >>> t = Table.from_rows([dict(ID='1', Name='a'), dict(ID='2', Name='b')])
+        >>> [row['ID'] for row in t.filter(Name=lambda v: v != 'a')]
+        ['2']
+    """
+    def __init__(self, columns: dict[str, Column]):
+        if len(set(len(col) for col in columns.values())) > 1:
+            raise ValueError('Columns must have the same length')
+        self.columns = columns
+
+    @classmethod
+    def from_rows(
+            cls,
+            rows: Iterable[Union[dict[str, str], list[str]]],
+            header: Optional[list[str]] = None,
+    ) -> 'Table':
+        """
+        Create a table from rows, given as `dict`s or - with `header` or with the header as \
+        first row - as `list`s.
+        """
+        rows = iter(rows)
+        first = next(rows, None)
+        if isinstance(first, dict):
+            header = header or list(first)
+        elif header is None:
+            header, first = first or [], None
+        columns = [Column() for _ in header]
+        for row in itertools.chain([first] if first is not None else [], rows):
+            if isinstance(row, dict):
+                row = [row.get(name, '') for name in header]
+            for col, value in zip(columns, itertools.chain(row, itertools.repeat(''))):
+                col.append(value)
+        return cls(dict(zip(header, columns)))
+
+    @property
+    def header(self) -> list[str]:
+        return list(self.columns)
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, name: str) -> Column:
+        return self.columns[name]
+
+    def __iter__(self) -> Iterator[dict[str, str]]:
+        """Iterate over the rows as `dict`s."""
+        header = self.header
+        for row in zip(*self.columns.values()):
+            yield dict(zip(header, row))
+
+    def take(self, indices: Iterable[int]) -> 'Table':
+        """A new table containing the selected rows."""
+        indices = list(indices)
+        return Table({name: col.take(indices) for name, col in self.columns.items()})
+
+    def filter(self, **conditions: ConditionType) -> 'Table':
+        """
+        A new table containing the rows matching all conditions.
+
+        :param conditions: Mapping of column names to conditions, as accepted by \
+        :meth:`Column.matching_codes`.
+        """
+        selected = [
+            (self.columns[name].codes, self.columns[name].matching_codes(condition))
+            for name, condition in conditions.items()]
+        return self.take(
+            i for i in range(len(self)) if all(codes[i] in ok for codes, ok in selected))
+
+    def groupby(self, *names: str) -> dict[Union[str, tuple[str, ...]], 'Table']:
+        """
+        Split the table into groups of rows with identical values in the specified columns.
+
+        :return: `dict` mapping the group key - a value, or a `tuple` of values if more than one \
+        column is specified - to the group's rows as :class:`Table`.
+        """
+        columns = [self.columns[name] for name in names]
+        groups = collections.defaultdict(list)
+        for i, key in enumerate(zip(*[col.codes for col in columns])):
+            groups[key].append(i)
+        res = {}
+        for key, indices in groups.items():
+            key = tuple(col.categories[c] for col, c in zip(columns, key))
+            res[key[0] if len(key) == 1 else key] = self.take(indices)
+        return res
+
+    def join(  # pylint: disable=R0913,R0917
+            self,
+            other: 'Table',
+            on: str,
+            right_on: Optional[str] = None,
+            columns: Optional[Iterable[str]] = None,
+            how: Literal['left', 'inner'] = 'left',
+    ) -> 'Table':
+        """
+        Add columns from a lookup table, i.e. a table with unique values in the key column.
+
+        :param on: Name of the key column in this table.
+        :param right_on: Name of the key column in `other` - defaults to `on`.
+        :param columns: Names of the columns of `other` to add - defaults to all but the key.
+        :param how: "left" to keep rows without match in `other` (with empty values in the \
+        added columns), "inner" to drop them.
+        """
+        right_on = right_on or on
+        key = other.columns[right_on]
+        if len(set(key.codes)) != len(key):
+            raise ValueError(f'Values in lookup column {right_on} are not unique')
+        columns = [n for n in other.header if n != right_on] if columns is None else list(columns)
+        clashes = set(columns).intersection(self.columns)
+        if clashes:
+            raise ValueError(f'Duplicate column names: {sorted(clashes)}')
+
+        # Map each distinct value in the key column to the matching row in the lookup table:
+        rows_by_code = {c: i for i, c in enumerate(key.codes)}
+        left = self.columns[on]
+        match = [rows_by_code.get(key.code(v)) for v in left.categories]
+
+        res = self
+        if how == 'inner':
+            res = self.take(i for i, c in enumerate(left.codes) if match[c] is not None)
+            left = res.columns[on]
+        res = Table(dict(res.columns))
+        for name in columns:
+            col = other.columns[name]
+            categories = list(col.categories)
+            try:
+                missing = categories.index('')
+            except ValueError:
+                missing = len(categories)
+                categories.append('')
+            codes = [missing if i is None else col.codes[i] for i in match]
+            res.columns[name] = Column(categories, array.array('I', (codes[c] for c in left.codes)))
+        return res
+
+    def to_pandas(self):
+        """
+        Convert the table to a `pandas.DataFrame` with categorical columns.
+
+        .. note::
+
+            Requires `pandas` to be installed.
+        """
+        try:
+            import pandas
+        except ImportError as e:
+            raise EnvironmentError('to_pandas is only available if pandas is installed') from e
+        return pandas.DataFrame({
+            name: pandas.Categorical.from_codes(col.codes, categories=col.categories)
+            for name, col in self.columns.items()})
+
+    def to_arrow(self):
+        """
+        Convert the table to a `pyarrow.Table` with dictionary-encoded columns.
+
+        .. note::
+
+            Requires `pyarrow` to be installed.
+        """
+        try:
+            import pyarrow
+        except ImportError as e:
+            raise EnvironmentError('to_arrow is only available if pyarrow is installed') from e
+        return pyarrow.table({
+            name: pyarrow.DictionaryArray.from_arrays(
+                pyarrow.array(col.codes, type=pyarrow.uint32()), pyarrow.array(col.categories))
+            for name, col in self.columns.items()})
@@ -3,15 +3,15 @@ Utilities.
 """
 import sys
 import pathlib
-import platform
-import subprocess
+import functools
 import importlib.metadata
 from typing import Literal, Union
 from collections.abc import Iterable, Generator
 
 import termcolor
+import platformdirs
 
-from ._compat import entry_points_select
+from ._compat import entry_points_select, packages_distributions
 
 
 def colored(color: Literal['red', 'blue'], text, **kw):
@@ -19,6 +19,13 @@ def colored(color: Literal['red', 'blue'], text, **kw):
     return termcolor.colored(text, color, **kw)
 
 
+def cache_dir() -> pathlib.Path:
+    """The directory where cldfbench caches data across runs."""
+    res = pathlib.Path(platformdirs.user_cache_dir('cldfbench'))
+    res.mkdir(parents=True, exist_ok=True)
+    return res
+
+
 def get_entrypoints(group: str) -> Iterable[importlib.metadata.EntryPoint]:
     """Get registered entry points for a group."""
     return entry_points_select(importlib.metadata.entry_points(), group)
@@ -41,36 +48,47 @@ def iter_aligned(
             yield f"{prefix}{p[0].ljust(maxlabel)}{p[1] or ''}"
 
 
+# Distributions which are omitted by `pip freeze`, too.
+FREEZE_EXCLUDES = {'pip', 'setuptools', 'wheel', 'distribute'}
+
+
+@functools.lru_cache(maxsize=None)
+def _distributions() -> tuple[tuple[str, str], dict[str, list[str]]]:
+    """
+    Names and versions of the installed distributions, and the mapping of top-level modules to
+    the distributions providing them - read from package metadata once per process.
+    """
+    dists = {}
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata['Name']
+        if not name:
+            continue  # pragma: no cover
+        if name.lower() not in FREEZE_EXCLUDES:
+            dists.setdefault(name.lower(), (name, dist.version))
+    return tuple(dists[k] for k in sorted(dists)), packages_distributions()
+
+
+def _requirements() -> list[str]:
+    dists, modules = _distributions()
+    imported = set(m.split('.')[0] for m in list(sys.modules))
+    imported_dists = {
+        dist.lower() for mod, dists_ in modules.items() if mod in imported for dist in dists_}
+    imported = {m.lower() for m in imported}
+    return [
+        f'{name}=={version}' for name, version in dists
+        if name.lower() in imported_dists
+        or name.lower() in imported
+        or name.lower().replace('python-', '') in imported]
+
+
 def iter_requirements() -> Generator[str, None, None]:
     """
     :return: generator of lines in pip's requirements.txt format, specifying packages which are \
     imported in the current python process.
+
+    .. note::
+
+        The installed distributions' metadata is read once per Python process, while the \
+        imported modules are determined on each call.
     """
-    imported = set(m.split('.')[0].lower() for m in sys.modules)
-    pip = pathlib.Path(sys.executable).parent / 'pip'
-
-    if platform.system() == "Windows":
-        pip = pip.with_suffix(".exe")  # pragma: no cover
-
-    if not pip.exists():  # pragma: no cover
-        pip = pathlib.Path(sys.executable).parent / 'pip3'
-
-        if platform.system() == "Windows":
-            pip = pip.with_suffix(".exe")
-    if not pip.exists():  # pragma: no cover
-        return
-
-    try:
-        installed = subprocess.check_output([str(pip), 'freeze'])
-    except subprocess.CalledProcessError as e:  # pragma: no cover
-        raise ValueError() from e
-
-    for req in installed.decode('utf-8').split('\n'):
-        if '==' in req:
-            pkg = req.split('==')[0]
-        elif 'egg=' in req:
-            pkg = req.split('egg=')[-1]  # pragma: no cover
-        else:
-            continue  # pragma: no cover
-        if (pkg.lower() in imported) or (pkg.lower().replace('python-', '') in imported):
-            yield req
+    yield from _requirements()
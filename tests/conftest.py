@@ -9,6 +9,14 @@ from cldfcatalog.repository import get_test_repo
 from cldfbench import Dataset
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path_factory, mocker):
+    d = tmp_path_factory.mktemp('cache')
+    mocker.patch(
+        'cldfbench.util.platformdirs', mocker.Mock(user_cache_dir=mocker.Mock(return_value=str(d))))
+    return d
+
+
 @pytest.fixture(scope='session')
 def csvw3():
     return packaging.version.parse(csvw.__version__) > packaging.version.parse('2.0.0')
@@ -1,7 +1,13 @@
+import os
+import gzip
+import pathlib
+
 import pytest
 
 from pycldf import Wordlist, Dataset
+from cldfcatalog import Repository
 
+from cldfbench import cldf
 from cldfbench.cldf import *
 
 
@@ -12,6 +18,9 @@ def test_cldf_spec_invalid():
     with pytest.raises(ValueError):
         _ = CLDFSpec(dir='.', module='invalid')
 
+    with pytest.raises(ValueError):
+        _ = CLDFSpec(dir='.', compression='rar')
+
 
 def test_cldf_spec(tmp_path):
     md = tmp_path / 'md.json'
@@ -58,3 +67,209 @@ def test_cldf_with_dataset(ds):
     cldf = Dataset.from_metadata(ds.cldf_dir.joinpath('Generic-metadata.json'))
     assert 'http://example.org/raw' in [
         p['rdf:about'] for p in cldf.properties['prov:wasDerivedFrom']]
+
+
+def test_cldf_buffer_on_disk(tmp_path):
+    with CLDFWriter(CLDFSpec(
+        module='StructureDataset', dir=tmp_path, buffer_on_disk=True)
+    ) as writer:
+        assert not writer.objects['ValueTable']
+        writer.objects['ValueTable'].append(
+            dict(ID=1, Language_ID='l', Parameter_ID='p', Value='x'))
+        writer.objects['ValueTable'].extend(
+            [dict(ID=i, Language_ID='l', Parameter_ID='p', Value='x') for i in range(2, 5)])
+        assert len(writer.objects['ValueTable']) == 4
+        assert [r['ID'] for r in writer.objects['ValueTable']] == [1, 2, 3, 4]
+        writer.objects['ValueTable'].append(
+            dict(ID=5, Language_ID='l', Parameter_ID='p', Value='x'))
+    ds = Dataset.from_metadata(tmp_path / 'StructureDataset-metadata.json')
+    assert len(list(ds['ValueTable'])) == 5
+
+
+@pytest.mark.parametrize('background', [False, True])
+def test_cldf_add_rows(tmp_path, background):
+    spec = CLDFSpec(module='StructureDataset', dir=tmp_path, background_validation=background)
+    with CLDFWriter(spec) as writer:
+        writer['ValueTable', 'value'].separator = '|'
+        writer.add_rows(
+            'ValueTable',
+            (dict(ID=str(i), Language_ID='l', Parameter_ID='p', Value=['1', 2]) for i in range(5)),
+            batch_size=2)
+    ds = Dataset.from_metadata(tmp_path / 'StructureDataset-metadata.json')
+    assert [v['Value'] for v in ds['ValueTable']] == [['1', '2']] * 5
+
+    with pytest.raises(ValueError, match='ValueTable row 2, column Language_ID'):
+        with CLDFWriter(spec) as writer:
+            writer.add_rows('ValueTable', [
+                dict(ID='1', Language_ID='l', Parameter_ID='p'),
+                dict(ID='2', Parameter_ID='p')])
+            if background:
+                writer._worker.join(timeout=0.1)
+                writer.add_rows('ValueTable', [])
+
+
+def test_cldf_max_workers(tmp_path, mocker):
+    with CLDFWriter(CLDFSpec(module='StructureDataset', dir=tmp_path, max_workers=2)) as writer:
+        writer.cldf.add_component('LanguageTable')
+        writer.cldf.add_sources('@book{b1,\ntitle={The Title}\n}')
+        writer.objects['LanguageTable'].append(dict(ID='l'))
+        writer.objects['ValueTable'].extend(
+            dict(ID=str(i), Language_ID='l', Parameter_ID='p', Value='x') for i in range(3))
+    ds = Dataset.from_metadata(tmp_path / 'StructureDataset-metadata.json')
+    assert ds['ValueTable'].common_props['dc:extent'] == 3
+    assert len(list(ds['LanguageTable'])) == 1
+    assert len(ds.sources) == 1
+
+    # Run a write job in-process:
+    with CLDFWriter(CLDFSpec(module='StructureDataset', dir=tmp_path / 'x')) as writer:
+        mocker.patch(
+            'cldfbench.cldf._WRITE_JOB', (writer, dict(ValueTable=[]), {'ValueTable'}))
+        assert cldf._write_table_job('ValueTable') == 0
+        assert tmp_path.joinpath('x', 'values.csv.zip').exists()
+
+
+def test_cldf_compression(tmp_path):
+    with CLDFWriter(CLDFSpec(
+        module='StructureDataset',
+        dir=tmp_path,
+        zipped=['values.csv', 'Source'],
+        compression='gzip',
+        compression_level=1,
+    )) as writer:
+        writer.objects['ValueTable'].extend(
+            dict(ID=str(i), Language_ID='l', Parameter_ID='p', Value='ä') for i in range(3))
+        writer.cldf.add_sources('@book{b1,\ntitle={The Title}\n}')
+    assert not tmp_path.joinpath('values.csv').exists()
+    assert len(Dataset.from_metadata(tmp_path / 'StructureDataset-metadata.json').sources) == 1
+    with gzip.open(tmp_path / 'values.csv.gz', 'rt', encoding='utf8') as fp:
+        assert fp.read().splitlines()[-1] == '2,l,p,ä,,,'
+
+
+def test_cldf_staged(tmp_path):
+    cldf_dir = tmp_path / 'cldf'
+    spec = CLDFSpec(module='StructureDataset', dir=cldf_dir, staged=True)
+    with CLDFWriter(spec) as writer:
+        assert writer.cldf_spec.dir != cldf_dir
+        assert not cldf_dir.exists()
+        writer.objects['ValueTable'].append(
+            dict(ID='1', Language_ID='l', Parameter_ID='p', Value='x'))
+    assert writer.cldf_spec is spec
+    assert len(list(Dataset.from_metadata(spec.metadata_path)['ValueTable'])) == 1
+
+    cldf_dir.joinpath('README.md').write_text('readme', encoding='utf8')
+    cldf_dir.joinpath('sub').mkdir()
+    with pytest.raises(ZeroDivisionError):
+        with CLDFWriter(spec) as writer:
+            writer.objects['ValueTable'].append(
+                dict(ID='2', Language_ID='l', Parameter_ID='p', Value='x'))
+            _ = 1 / 0
+    # The old data is untouched, and the staging directory has been removed:
+    assert [v['ID'] for v in Dataset.from_metadata(spec.metadata_path)['ValueTable']] == ['1']
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['cldf']
+
+    with CLDFWriter(spec, clean=False) as writer:
+        writer.cldf.add_component('LanguageTable')
+        writer.objects['LanguageTable'].append(dict(ID='l'))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['cldf']
+    assert sorted(p.name for p in cldf_dir.iterdir()) == [
+        '.gitattributes', 'README.md', 'StructureDataset-metadata.json', 'languages.csv',
+        'requirements.txt', 'sub', 'values.csv']
+    assert cldf_dir.joinpath('README.md').read_text(encoding='utf8') == 'readme'
+
+
+@pytest.mark.parametrize('fail', ['cldf', 'staging', 'restore'])
+def test_cldf_staged_swap_fails(tmp_path, mocker, fail):
+    cldf_dir = tmp_path / 'cldf'
+    spec = CLDFSpec(module='StructureDataset', dir=cldf_dir, staged=True)
+    with CLDFWriter(spec) as writer:
+        writer.objects['ValueTable'].append(
+            dict(ID='1', Language_ID='l', Parameter_ID='p', Value='x'))
+    cldf_dir.joinpath('media').mkdir()
+    cldf_dir.joinpath('media', 'f.wav').write_bytes(b'abc')
+
+    rename = pathlib.Path.rename
+
+    def failing_rename(self, target):
+        if (fail == 'cldf' and self == cldf_dir) \
+                or (fail != 'cldf' and pathlib.Path(target) == cldf_dir
+                    and not self.name.endswith('.old')) \
+                or (fail == 'restore' and pathlib.Path(target).parent.name.endswith('.old')):
+            raise PermissionError(str(self))
+        return rename(self, target)
+
+    mocker.patch('pathlib.Path.rename', failing_rename)
+    with pytest.raises(RuntimeError if fail == 'restore' else PermissionError):
+        with CLDFWriter(spec) as writer:
+            writer.objects['ValueTable'].append(
+                dict(ID='2', Language_ID='l', Parameter_ID='p', Value='x'))
+    mocker.stopall()
+
+    if fail == 'restore':
+        # Neither the old cldf directory nor the staging directory holding media/ is removed:
+        assert not cldf_dir.exists()
+        assert len(list(tmp_path.glob('*/media/f.wav'))) == 1
+        assert len(list(tmp_path.iterdir())) == 2
+    else:
+        assert cldf_dir.joinpath('media', 'f.wav').read_bytes() == b'abc'
+        assert [v['ID'] for v in Dataset.from_metadata(spec.metadata_path)['ValueTable']] == ['1']
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['cldf']
+
+
+def test_cldf_staged_swap_fails_new(tmp_path, mocker):
+    mocker.patch('pathlib.Path.rename', side_effect=PermissionError)
+    with pytest.raises(PermissionError):
+        with CLDFWriter(CLDFSpec(module='StructureDataset', dir=tmp_path / 'cldf', staged=True)):
+            pass
+    assert not list(tmp_path.iterdir())
+
+
+def test_cldf_unchanged_files(tmp_path):
+    def write(value='x', zipped=(), sources=True):
+        with CLDFWriter(CLDFSpec(module='StructureDataset', dir=tmp_path, zipped=zipped)) as w:
+            w.objects['ValueTable'].append(
+                dict(ID='1', Language_ID='l', Parameter_ID='p', Value=value))
+            if sources:
+                w.cldf.add_sources('@book{b1,\ntitle={The Title}\n}')
+        return {p.name: p.stat().st_mtime_ns for p in tmp_path.iterdir()}
+
+    def age(mtimes):
+        for name, mtime in mtimes.items():
+            os.utime(tmp_path / name, ns=(mtime - 10**10, mtime - 10**10))
+        return {p.name: p.stat().st_mtime_ns for p in tmp_path.iterdir()}
+
+    mtimes = age(write())
+    assert write() == mtimes
+    tmp_path.joinpath('stale.csv').write_text('', encoding='utf8')
+    res = write('y')
+    assert 'stale.csv' not in res
+    assert res['values.csv'] > mtimes['values.csv']
+    assert res['StructureDataset-metadata.json'] == mtimes['StructureDataset-metadata.json']
+    assert res['sources.bib'] == mtimes['sources.bib']
+
+    mtimes = age(write(zipped=['ValueTable', 'Source']))
+    assert 'values.csv' not in mtimes
+    assert write(zipped=['ValueTable', 'Source']) == mtimes
+
+    # Files which are no longer written are removed:
+    assert 'sources.bib.zip' not in write(zipped=['ValueTable', 'Source'], sources=False)
+    assert 'sources.bib' in write()
+    assert 'sources.bib' not in write(sources=False)
+
+    spec = CLDFSpec(dir=tmp_path / 'x')
+    spec.dir.mkdir()
+    spec.dir.joinpath('test.txt').write_text('', encoding='utf8')
+    assert spec.make_clean()[0].name == 'test.txt'
+    assert not spec.dir.joinpath('test.txt').exists()
+
+
+def test_cldf_provenance_cache(ds, mocker):
+    json_ld = mocker.spy(Repository, 'json_ld')
+    with provenance_cache(), provenance_cache():
+        for _ in range(2):
+            with CLDFWriter(CLDFSpec(dir=ds.cldf_dir), dataset=ds):
+                pass
+    assert json_ld.call_count > 0
+    calls = json_ld.call_count
+    with CLDFWriter(CLDFSpec(dir=ds.cldf_dir), dataset=ds):
+        pass
+    assert json_ld.call_count == 2 * calls
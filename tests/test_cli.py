@@ -66,10 +66,17 @@ def test_cldfreadme(tmp_path, tmpds, glottolog_dir):
     assert '# CLDF datasets' in tmp_path.joinpath('cldf', 'README.md').read_text(encoding='utf8')
 
 
-def test_help(capsys):
+def test_help(capsys, cache_dir):
     _main('')
     out, _ = capsys.readouterr()
     assert 'usage' in out
+    assert 'Run generic CLDF checks' in out
+    assert cache_dir.joinpath('commands.json').exists()
+
+    with pytest.raises(SystemExit):
+        _main('stub -h')
+    out, _ = capsys.readouterr()
+    assert '--concepticon' in out
 
 
 @pytest.mark.with_catalog
@@ -239,6 +246,34 @@ def test_check(tmpds, tmp_path):
     assert _main('check ' + str(tmpds), log=logging.getLogger(__name__)) == 0
 
 
+def test_check_jobs(tmpds, tmp_path, monkeypatch, caplog):
+    monkeypatch.chdir(tmp_path)
+    with caplog.at_level(logging.INFO):
+        assert _main('check --glob --jobs 2 "module*.py"') == 0
+    done = [r.message for r in caplog.records if r.message.startswith('... done')]
+    assert len(done) == 3
+
+
+def test_with_dataset_job(fixtures_dir, mocker):
+    from cldfbench import cli_util
+
+    def func(ds, args):
+        args.log.info('%s', ds.id)
+        try:
+            _ = 1 / 0
+        except ZeroDivisionError:
+            args.log.exception('failed')
+        return 5
+
+    ds = cli_util._get(str(fixtures_dir / 'module.py'))
+    mocker.patch.object(cli_util, '_JOB', (argparse.Namespace(log=None), func, [ds]))
+    res, records = cli_util._with_dataset_job(0)
+    assert res == 5 and records[1].getMessage() == 'thing'
+    # Tracebacks are kept when records are replayed:
+    assert records[2].exc_info is None
+    assert 'ZeroDivisionError' in logging.Formatter().format(records[2])
+
+
 @pytest.mark.with_catalog
 def test_media(tmpds_media, tmp_path, glottolog_dir, capsys, mocker):
     releasedir = pathlib.Path('thing_{}'.format(MEDIA))
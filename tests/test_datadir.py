@@ -1,13 +1,28 @@
+import re
+import json
 import logging
+import io
+import bz2
+import lzma
+import email.utils
+import argparse
 import sys
 import gzip
 import shutil
+import threading
+import zipfile
 import contextlib
+import http.server
 import urllib.error
+from xml.etree import ElementTree as et
 
 import pytest
+import openpyxl
+from simplepybtex.database import BibliographyDataError
 
+import cldfbench.datadir
 from cldfbench.datadir import *
+from cldfbench.datadir import _Validators
 
 
 @pytest.fixture
@@ -18,6 +33,72 @@ def datadir(tmp_path, fixtures_dir):
     return DataDir(tmp_path)
 
 
+@pytest.fixture
+def http_server(tmp_path):
+    """A local HTTP server serving files from a directory."""
+    root = tmp_path / 'www'
+    root.mkdir()
+    hits = {}
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def __init__(self, *args, **kw):
+            super().__init__(*args, directory=str(root), **kw)
+
+        def do_GET(self):
+            hits[self.path] = hits.get(self.path, 0) + 1
+            if self.path == '/flaky' and hits[self.path] < 2:
+                self.send_response(503)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            if self.path == '/truncated' and hits[self.path] < 2:
+                # Send only part of the body and close the connection:
+                self.send_response(200)
+                self.send_header('Content-Length', '10')
+                self.end_headers()
+                self.wfile.write(b'ab')
+                self.close_connection = True
+                return
+            bad_range = self.path == '/badrange'
+            if self.path in ('/flaky', '/badrange', '/truncated'):
+                self.path = '/a.txt'
+            if self.path in ('/redirect', '/loop'):
+                self.send_response(302)
+                self.send_header('Location', '/a.txt' if self.path == '/redirect' else '/loop')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            p = root.joinpath(self.path[1:])
+            if self.headers.get('Range') and p.exists() and self.headers.get('If-Range') \
+                    == self.date_time_string(p.stat().st_mtime):
+                data = p.read_bytes()
+                offset = 0 if bad_range else int(self.headers['Range'].split('=')[1].split('-')[0])
+                if offset >= len(data):
+                    self.send_response(416)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {offset}-{len(data) - 1}/{len(data)}')
+                self.send_header('Content-Length', str(len(data) - offset))
+                self.end_headers()
+                self.wfile.write(data[offset:])
+                return
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}', root, hits
+    server.shutdown()
+    server.server_close()
+
+
 @pytest.mark.with_internet
 def test_urlopen():
     try:
@@ -42,6 +123,12 @@ def test_datadir(datadir):
         f.write(text.encode('utf8'))
     assert datadir.read('test.gz') == text
 
+    # Line endings of compressed content are not translated:
+    with gzip.open(datadir.joinpath('crlf.gz'), 'wb') as f:
+        f.write(b'a\r\nb\r\n')
+    assert datadir.read('crlf.gz') == 'a\r\nb\r\n'
+
+
 def test_datadir_csv(datadir):
     rows = [['a', 'b'], ['c', 'd']]
     datadir.write_csv('test.csv', rows)
@@ -49,13 +136,88 @@ def test_datadir_csv(datadir):
     assert datadir.read_csv('test.csv', normalize='NFC') == rows
     assert datadir.read_csv(
             'test.csv', normalize='NFC', dicts=True)[0]['a'] =='c'
+    rows = datadir.iter_csv('test.csv', normalize='NFD', dicts=True)
+    assert not isinstance(rows, list)
+    assert next(rows)['b'] == 'd'
+    assert list(datadir.iter_csv('test.csv')) == [['a', 'b'], ['c', 'd']]
+
+
+def test_datadir_compressed(datadir):
+    text = 'ID,Name\n1,a\u0301\n2,b\n'
+    for suffix, opener in [('.gz', gzip.open), ('.bz2', bz2.open), ('.xz', lzma.open)]:
+        with opener(datadir / f'test.csv{suffix}', 'wt', encoding='utf8') as fp:
+            fp.write(text)
+        assert datadir.read_csv(f'test.csv{suffix}', dicts=True)[0]['Name'] == 'a\u0301'
+        assert datadir.read(f'test.csv{suffix}', normalize='NFC') == \
+            'ID,Name\n1,\u00e1\n2,b\n'
+    with zipfile.ZipFile(datadir / 'test.csv.zip', 'w') as zipf:
+        zipf.writestr('README', 'x')
+        zipf.writestr('test.csv', text)
+    assert datadir.read_csv('test.csv.zip', normalize='NFC')[1] == ['1', '\u00e1']
+    assert datadir.read_csv('test.csv.zip', aname='README') == [['x']]
+    assert 'opendocument' in datadir.read('test.ods', suffix='.zip')
+
+    lines = list(datadir.iter_lines('test.csv.gz', normalize='NFC'))
+    assert lines == ['ID,Name', '1,\u00e1', '2,b']
+    with datadir.open_text('test.csv.xz', normalize='NFC') as fp:
+        assert fp.readable()
+        assert fp.read(4) == 'ID,N'
+        assert fp.readline() == 'ame\n'
+        assert fp.readline(2) == '1,'
+        assert fp.read(100) == '\u00e1\n2,b\n'
+        assert fp.read() == ''
+
+
+def test_datadir_bib(datadir, cache_dir):
+    datadir.write('sources.bib', """@string{ML = "Mouton"}
+@book{a,
+  title={Title with
+@ at line start},
+  publisher=ML
+}
 
+@article{b,
+    title={\\{braces\\}},
+    author={Meier, A. and Müller, B.},
+}
+""")
+    srcs = datadir.iter_bib()
+    assert next(srcs).id == 'a'
+    srcs = datadir.read_bib(cache=True)
+    assert [s.id for s in srcs] == ['a', 'b']
+    assert srcs[0]['publisher'] == 'Mouton'
+    assert srcs[1]['author'] == 'Meier, A. and Müller, B.'
+    assert len(list(cache_dir.joinpath('bib').glob('*.pickle'))) == 1
+    assert datadir.read_bib(cache=True) == srcs
 
-def test_datadir_xml(datadir):
+    datadir.write('dupes.bib', '@book{a,\ntitle={x}\n}\n\n@book{A,\ntitle={y}\n}\n')
+    with pytest.raises(BibliographyDataError, match='repeated bibliography entry: A'):
+        datadir.read_bib('dupes.bib')
+
+
+def test_datadir_xml(datadir, mocker):
     assert datadir.read_xml('test.xml').find('b').text == 'b'
+    assert [e.text for e in datadir.iter_xml('test.xml', 'b', wrap=True)] == ['b']
+
+    datadir.write(
+        'lift.xml',
+        '<lift><entry id="1"><form>a\x01</form></entry><x/><entry id="2"/></lift>')
+    ids = []
+    for e in datadir.iter_xml('lift.xml', 'entry'):
+        ids.append(e.get('id'))
+        if e.get('id') == '1':
+            assert e.find('form').text == 'a'
+    assert ids == ['1', '2']
+    assert len(list(datadir.iter_xml('lift.xml', ['entry', 'form']))) == 3
+
+    # Yielded elements are removed from the tree:
+    datadir.write('many.xml', '<lift>{}</lift>'.format('<entry><form>a</form></entry>' * 20000))
+    iterparse = mocker.spy(et, 'iterparse')
+    assert len(list(datadir.iter_xml('many.xml', 'entry'))) == 20000
+    assert len(iterparse.spy_return.root) == 0
 
 
-def test_datadir_excel(datadir):
+def test_datadir_excel(datadir, mocker):
     res = datadir.xls2csv(datadir / 'test.xls')
     assert res['Sheet2'].stem == 'test.Sheet2'
 
@@ -68,6 +230,42 @@ def test_datadir_excel(datadir):
     assert data[1] == ['1.01']
     assert data[2] == ['2']
 
+    datadir.joinpath('x').mkdir()
+    res = datadir.xlsx2csv(datadir / 'test.xlsx', outdir=datadir / 'x', read_only=False)
+    assert datadir.read_csv(res['Sheet2']) == data
+
+    datadir.joinpath('y').mkdir()
+    load_workbook = mocker.spy(openpyxl, 'load_workbook')
+    res = datadir.xlsx2csv(
+        datadir / 'test.xlsx', outdir=datadir / 'y', read_only=False, max_workers=2)
+    assert datadir.read_csv(res['Sheet2']) == data
+    # The workbook is only loaded in read-only mode in the main process:
+    assert load_workbook.call_count == 1 and load_workbook.call_args[1]['read_only']
+
+    res = datadir.xlsx2csv(datadir / 'test.xlsx', skip_sheets=['Sheet2'], max_workers=2)
+    assert 'Sheet2' not in res
+
+
+def test_datadir_xlsx_wrong_dimension(datadir):
+    wb = openpyxl.Workbook()
+    wb.active.title = 'Sheet'
+    for row in [['a', 'b', 'c'], ['d'], ['e', None, 'f']]:
+        wb.active.append(row)
+    wb.save(str(datadir / 'dim.xlsx'))
+    # Mimick writers which emit a wrong dimension tag:
+    with zipfile.ZipFile(str(datadir / 'dim.xlsx')) as zin, \
+            zipfile.ZipFile(str(datadir / 'wrong.xlsx'), 'w') as zout:
+        for info in zin.infolist():
+            content = zin.read(info.filename)
+            if info.filename.endswith('sheet1.xml'):
+                content = re.sub(rb'<dimension ref="[^"]+"', b'<dimension ref="A1"', content)
+            zout.writestr(info, content)
+
+    expected = [['a', 'b', 'c'], ['d', '', ''], ['e', '', 'f']]
+    assert datadir.read_csv(datadir.xlsx2csv('wrong.xlsx')['Sheet']) == expected
+    assert datadir.read_csv(
+        datadir.xlsx2csv('wrong.xlsx', read_only=False)['Sheet']) == expected
+
 
 def test_datadir_ods(datadir):
     res = datadir.ods2csv(datadir / 'test.ods')
@@ -88,10 +286,65 @@ def test_datadir_ods(datadir):
     assert len(data3) == 4
 
 
+def test_datadir_read_table(datadir):
+    datadir.write_csv('test.csv', [['ID', 'Name'], ['1', 'a'], ['2', 'b']])
+    t = datadir.read_table('test.csv', dicts=True)
+    assert t.header == ['ID', 'Name']
+    assert [r['ID'] for r in t.filter(Name='b')] == ['2']
+
+
+def test_datadir_lookup(datadir):
+    datadir.write_csv('test.csv', [['ID', 'Name'], ['1', 'a'], ['2', 'b']])
+    with datadir.lookup('test.csv', 'Name', 'ID') as lookup:
+        assert lookup['b'] == '2'
+
+
+def test_datadir_spreadsheet_conversion_cache(datadir, mocker):
+    res = datadir.ods2csv('test.ods')
+    iter_ods_rows = mocker.spy(cldfbench.datadir, '_iter_ods_rows')
+    assert datadir.ods2csv('test.ods') == res
+    assert not iter_ods_rows.called
+
+    # Modified CSV files invalidate the cache:
+    content = res['Sheet2'].read_text(encoding='utf8')
+    res['Sheet2'].write_text('cached', encoding='utf8')
+    assert datadir.ods2csv('test.ods') == res
+    assert res['Sheet2'].read_text(encoding='utf8') == content
+    mocker.stopall()
+
+    # So do conversions by other versions of cldfbench:
+    conversions = datadir.read_json('.spreadsheet-conversions.json')
+    for v in conversions.values():
+        v['version'] = 1
+    datadir.write('.spreadsheet-conversions.json', json.dumps(conversions))
+    res['Sheet2'].write_text('cached', encoding='utf8')
+    datadir.ods2csv('test.ods')
+    assert res['Sheet2'].read_text(encoding='utf8') == content
+
+    # Different options invalidate the cache:
+    datadir.joinpath('x').mkdir()
+    assert datadir.ods2csv('test.ods', outdir=datadir / 'x')['Sheet2'].parent.name == 'x'
+    res2 = datadir.xlsx2csv('test.xlsx')
+    assert datadir.xlsx2csv('test.xlsx', skip_sheets=['Sheet2']) != res2
+
+    # Missing CSV files invalidate the cache:
+    res['Sheet2'].unlink()
+    datadir.ods2csv('test.ods')
+    assert res['Sheet2'].read_text(encoding='utf8') == content
+
+    # So does a modified spreadsheet:
+    shutil.copy(datadir / 'test.xlsx', datadir / 'test.ods')
+    mocker.patch('cldfbench.datadir._iter_ods_rows', mocker.Mock(return_value=[]))
+    assert datadir.ods2csv('test.ods') == {}
+
+
 def test_datadir_download_and_unpack(datadir, mocker, caplog):
     @contextlib.contextmanager
     def mock_urlopen(*args, **kw):
-        yield mocker.Mock(status=201, read=lambda: datadir.joinpath('test.zip').open('rb').read())
+        yield mocker.Mock(
+            status=201,
+            headers={},
+            read=io.BytesIO(datadir.joinpath('test.zip').read_bytes()).read)
 
     mocker.patch('cldfbench.datadir.urlopen', mock_urlopen)
     datadir.download_and_unpack('')
@@ -103,3 +356,130 @@ def test_datadir_download_and_unpack(datadir, mocker, caplog):
         assert caplog.records[0].levelname == 'warning'.upper()
 
     datadir.download('', 'fname', skip_if_exists=True)
+
+
+def test_datadir_download_many(datadir, http_server, caplog):
+    url, root, hits = http_server
+    root.joinpath('a.txt').write_text('abc', encoding='utf8')
+    root.joinpath('b.txt').write_text('x' * 100000, encoding='utf8')
+
+    with caplog.at_level(logging.INFO):
+        res = datadir.download_many(
+            {
+                f'{url}/a.txt': 'a.txt',
+                f'{url}/b.txt': 'b.txt',
+                f'{url}/redirect': 'c.txt',
+                f'{url}/flaky': 'd.txt',
+                f'{url}/missing': 'e.txt',
+                'ftp://example.org': 'f.txt',
+                f'{url}/loop': 'g.txt',
+            },
+            max_workers=2,
+            backoff=0.01,
+            log=logging.getLogger(__name__))
+    assert res[f'{url}/a.txt'].ok and res[f'{url}/b.txt'].size == 100000
+    assert datadir.read('c.txt') == 'abc'
+    assert res[f'{url}/flaky'].attempts == 2 and datadir.read('d.txt') == 'abc'
+    assert res[f'{url}/missing'].status == 404 and not res[f'{url}/missing'].ok
+    assert not datadir.joinpath('e.txt').exists()
+    assert not res['ftp://example.org'].ok
+    assert 'redirects' in res[f'{url}/loop'].error
+    assert len(caplog.records) == 7
+
+    res = datadir.download_many([(f'{url}/a.txt', 'a.txt')], skip_if_exists=True)
+    assert res[f'{url}/a.txt'].ok and res[f'{url}/a.txt'].status is None
+
+    res = datadir.download_many([('http://127.0.0.1:1/x', 'x.txt')], retries=1, backoff=0.01)
+    assert res['http://127.0.0.1:1/x'].attempts == 2
+    assert 'ConnectionRefusedError' in res['http://127.0.0.1:1/x'].error
+
+
+def test_datadir_download_resume(datadir, http_server):
+    url, root, hits = http_server
+    root.joinpath('a.txt').write_text('abc', encoding='utf8')
+    last_modified = email.utils.formatdate(root.joinpath('a.txt').stat().st_mtime, usegmt=True)
+
+    def interrupted(fname, data, path='/a.txt', validator=last_modified):
+        datadir.write(f'{fname}.part', data)
+        datadir.write(f'{fname}.part.json', json.dumps(dict(url=url + path, validator=validator)))
+
+    interrupted('a.txt', 'ab')
+    assert datadir.download(f'{url}/a.txt', 'a.txt').read_text(encoding='utf8') == 'abc'
+    assert not list(datadir.glob('a.txt.part*'))
+
+    # Partial content which cannot be continued is discarded:
+    for data, path, validator in [
+        ('abcd', '/a.txt', last_modified),  # 416 Range Not Satisfiable
+        ('xy', '/a.txt', 'Thu, 01 Jan 1970 00:00:00 GMT'),  # Data changed since.
+        ('xy', '/a.txt', None),  # No validator recorded.
+        ('xy', '/badrange', last_modified),  # Response doesn't continue the partial data.
+    ]:
+        interrupted('a.txt', data, path=path, validator=validator)
+        assert datadir.download(url + path, 'a.txt').read_text(encoding='utf8') == 'abc'
+        assert not list(datadir.glob('a.txt.part*'))
+
+    interrupted('b.txt', 'a')
+    interrupted('c.txt', 'abcd', path='/redirect')
+    interrupted('d.txt', 'xy', path='/badrange')
+    res = datadir.download_many(
+        {f'{url}/a.txt': 'b.txt', f'{url}/redirect': 'c.txt', f'{url}/badrange': 'd.txt'})
+    assert res[f'{url}/a.txt'].status == 206 and res[f'{url}/a.txt'].size == 3
+    assert res[f'{url}/badrange'].status == 200
+    assert datadir.read('b.txt') == datadir.read('c.txt') == datadir.read('d.txt') == 'abc'
+    assert not list(datadir.glob('*.part*'))
+
+    # A connection broken while reading the body is not re-used:
+    res = datadir.download_many({f'{url}/truncated': 'e.txt'}, retries=1, backoff=0.01)
+    assert res[f'{url}/truncated'].ok and res[f'{url}/truncated'].attempts == 2
+    assert hits['/truncated'] == 2 and datadir.read('e.txt') == 'abc'
+
+
+def test_datadir_download_revalidate(datadir, http_server, caplog):
+    url, root, hits = http_server
+    root.joinpath('a.txt').write_text('abc', encoding='utf8')
+
+    datadir.download(f'{url}/a.txt', 'a.txt', revalidate=True)
+    assert f'{url}/a.txt' in datadir.read_json('.http-validators.json')
+    datadir.write('a.txt', 'xyz')
+    with caplog.at_level(logging.INFO):
+        datadir.download(f'{url}/a.txt', 'a.txt', log=logging.getLogger(__name__), revalidate=True)
+        assert '304' in caplog.records[-1].message
+    # Not modified, so the local file was not overwritten:
+    assert datadir.read('a.txt') == 'xyz'
+    # Without revalidation, the data is downloaded:
+    datadir.download(f'{url}/a.txt', 'a.txt')
+    assert datadir.read('a.txt') == 'abc'
+
+    res = datadir.download_many({f'{url}/a.txt': 'b.txt'}, revalidate=True)
+    assert res[f'{url}/a.txt'].status == 200
+    res = datadir.download_many({f'{url}/a.txt': 'b.txt'}, revalidate=True)
+    assert res[f'{url}/a.txt'].status == 304 and res[f'{url}/a.txt'].size == 3
+    assert len(datadir.read_json('.http-validators.json')) == 1
+
+    validators = _Validators(datadir)
+    validators.update('x', datadir / 'a.txt', argparse.Namespace(headers={'ETag': 'e'}))
+    assert validators.headers('x', datadir / 'a.txt') == {'If-None-Match': 'e'}
+    validators.update('x', datadir / 'a.txt', argparse.Namespace(headers={}))
+    assert validators.headers('x', datadir / 'a.txt') == {}
+
+
+def test_datadir_download_and_unpack_glob(datadir, http_server):
+    url, root, _ = http_server
+    with zipfile.ZipFile(root / 'a.zip', 'w') as zipf:
+        zipf.writestr('data/', '')
+        zipf.writestr('data/a.csv', 'a')
+        zipf.writestr('data/b.csv', 'b')
+        zipf.writestr('data/c.txt', 'c')
+        zipf.writestr('README', 'r')
+    res = datadir.download_and_unpack(f'{url}/a.zip', 'data/*.csv', 'README', max_workers=2)
+    assert sorted(p.name for p in res) == ['README', 'a.csv', 'b.csv']
+    assert datadir.read('b.csv') == 'b'
+    assert not datadir.joinpath('c.txt').exists()
+    assert not datadir.joinpath('ds.zip').exists()
+
+    # Of members with the same name, the last one wins:
+    with zipfile.ZipFile(root / 'b.zip', 'w') as zipf:
+        for i in range(10):
+            zipf.writestr(f'{i}/data.csv', str(i) * 100000)
+    res = datadir.download_and_unpack(f'{url}/b.zip', '*/data.csv', max_workers=4)
+    assert len(res) == 10 and datadir.read('data.csv') == '9' * 100000
@@ -2,6 +2,7 @@ import pathlib
 import argparse
 
 from cldfbench.dataset import *
+from cldfbench.catalogs import Catalog
 
 
 def test_get_dataset_from_path(fixtures_dir):
@@ -19,6 +20,40 @@ def test_get_dataset_from_id(mocker, ds_cls):
     assert isinstance(get_dataset('this'), ds_cls)
 
 
+def test_get_dataset_from_index(mocker, monkeypatch, ds_cls, cache_dir):
+    class Other(ds_cls):
+        id = 'other'
+
+    def ep(name, cls):
+        res = mocker.Mock(load=mocker.Mock(return_value=cls), value=name)
+        res.name = name
+        return res
+
+    eps = [ep('this', ds_cls), ep('other', Other)]
+    mocker.patch('cldfbench.dataset.get_entrypoints', mocker.Mock(return_value=eps))
+    assert isinstance(get_dataset('other'), Other)
+    assert cache_dir.joinpath('dataset_index.json').exists()
+    assert len(list(iter_datasets())) == 2
+
+    eps[1].load.reset_mock()
+    assert isinstance(get_dataset('this'), ds_cls)
+    assert not eps[1].load.called
+
+    # Indexes are kept per Python environment:
+    monkeypatch.setattr('cldfbench.dataset.sys.prefix', '/other/venv')
+    assert isinstance(get_dataset('this'), ds_cls)
+    assert eps[1].load.called
+    monkeypatch.undo()
+    eps[1].load.reset_mock()
+    assert isinstance(get_dataset('this'), ds_cls)
+    assert not eps[1].load.called
+
+    # A stale index is refreshed:
+    Other.id = 'changed'
+    assert get_dataset('other') is None
+    assert isinstance(get_dataset('changed'), Other)
+
+
 def test_cldf(ds, mocker):
     class Catalog:
         def json_ld(self):
@@ -62,3 +97,31 @@ def test_dataset_with_custom_datadir(tmp_path):
         datadir_cls = DD
 
     assert DS().raw_dir.hello() == 'hello'
+
+
+def test_makecldf_incremental(ds_cls, mocker):
+    class DS(ds_cls):
+        calls = 0
+
+        def cmd_makecldf(self, args):
+            DS.calls += 1
+            # Changes to the inputs made while running makecldf don't trigger the next run:
+            self.etc_dir.write('run.txt', str(DS.calls))
+
+    ds = DS()
+    ds.etc_dir.mkdir()
+    ds.etc_dir.write('languages.csv', 'ID\nl')
+    args = argparse.Namespace(log=mocker.Mock(), incremental=True, cat=Catalog(ds.etc_dir))
+    ds._cmd_makecldf(args)
+    spec = ds.cldf_specs_dict[None]
+    assert spec.manifest_path.exists() and not spec.manifest_path.is_relative_to(ds.dir)
+    assert ds._cmd_makecldf(args) == -1
+    assert DS.calls == 1
+
+    ds.etc_dir.write('languages.csv', 'ID\nl\nm')
+    ds._cmd_makecldf(args)
+    assert DS.calls == 2
+
+    ds._cmd_makecldf(argparse.Namespace(log=mocker.Mock()))
+    assert DS.calls == 3
+    assert not spec.manifest_path.exists()
@@ -0,0 +1,81 @@
+import os
+import multiprocessing
+import concurrent.futures
+
+import pytest
+
+from cldfbench.lookup import Lookup
+
+
+@pytest.fixture
+def csv(tmp_path):
+    res = tmp_path / 'languages.csv'
+    res.write_text('ID,Name,Glottocode\n1,English,stan1293\n2,Deutsch,stan1295\n3,Ä\n', 'utf8')
+    return res
+
+
+def test_Lookup(csv, tmp_path):
+    with Lookup.for_csv(csv, 'Name', index_dir=tmp_path / 'idx') as lookup:
+        assert len(lookup) == 3
+        assert list(lookup) == ['English', 'Deutsch', 'Ä']
+        assert lookup['Ä'] == dict(ID='3', Name='Ä', Glottocode='')
+        assert 'Dutch' not in lookup and 1 not in lookup
+        assert lookup.get('Dutch') is None
+        with pytest.raises(KeyError):
+            _ = lookup[1]
+        assert [r['ID'] for r in lookup.rows()] == ['1', '2', '3']
+
+    with Lookup.for_csv(csv, 'Name', 'Glottocode', index_dir=tmp_path / 'idx') as lookup:
+        assert lookup['English'] == 'stan1293'
+        assert list(lookup.rows())[-1] == ''
+
+
+def test_Lookup_invalidation(csv, tmp_path, mocker):
+    idx = tmp_path / 'idx'
+    Lookup.for_csv(csv, 'ID', index_dir=idx).close()
+    write_index = mocker.patch('cldfbench.lookup._write_index')
+
+    # Same stats - nothing to do:
+    Lookup.for_csv(csv, 'ID', index_dir=idx).close()
+    # Different mtime, but same content - only the stats are updated:
+    os.utime(csv, ns=(0, 0))
+    Lookup.for_csv(csv, 'ID', index_dir=idx).close()
+    assert not write_index.called
+    mocker.stopall()
+
+    csv.write_text('ID,Name\n1,x\n', encoding='utf8')
+    with Lookup.for_csv(csv, 'ID', 'Name', index_dir=idx) as lookup:
+        assert dict(lookup) == {'1': 'x'}
+
+    # Corrupt index files are rebuilt:
+    for p in idx.iterdir():
+        p.write_bytes(b'x')
+    with Lookup.for_csv(csv, 'ID', 'Name', index_dir=idx) as lookup:
+        assert dict(lookup) == {'1': 'x'}
+
+
+def test_Lookup_errors(csv, tmp_path):
+    with pytest.raises(KeyError):
+        Lookup.for_csv(csv, 'Concept', index_dir=tmp_path)
+    csv.write_text('ID,Name\n1,x\n1,y\n', encoding='utf8')
+    with pytest.raises(ValueError):
+        Lookup.for_csv(csv, 'ID', index_dir=tmp_path)
+
+
+def _lookup_size(args):  # pragma: no cover
+    with Lookup.for_csv(*args) as lookup:
+        return len(lookup)
+
+
+@pytest.mark.skipif(
+    'fork' not in multiprocessing.get_all_start_methods(), reason='requires fork')
+def test_Lookup_concurrent(tmp_path):
+    csv = tmp_path / 'big.csv'
+    csv.write_text(
+        'ID,Name\n' + ''.join(f'{i},n{i}\n' for i in range(50000)), encoding='utf8')
+    idx = tmp_path / 'idx'
+    idx.mkdir()
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=4, mp_context=multiprocessing.get_context('fork')) as executor:
+        assert set(executor.map(_lookup_size, [(csv, 'ID', None, idx)] * 8)) == {50000}
+    assert [p.suffix for p in idx.iterdir()] == ['.idx']
@@ -0,0 +1,67 @@
+import pytest
+
+from cldfbench.table import Table
+
+
+@pytest.fixture
+def table():
+    return Table.from_rows([
+        ['ID', 'Language', 'Form'],
+        ['1', 'a', 'x'],
+        ['2', 'b', 'y'],
+        ['3', 'a', 'z'],
+        ['4', 'c'],
+    ])
+
+
+def test_Table(table):
+    assert len(table) == 4
+    assert table.header == ['ID', 'Language', 'Form']
+    assert table['Language'].categories == ['a', 'b', 'c']
+    assert list(table)[-1] == dict(ID='4', Language='c', Form='')
+    assert table['Form'][1] == 'y'
+    assert len(Table.from_rows([])) == 0
+    assert Table.from_rows([dict(a='1')], header=['a', 'b'])['b'][0] == ''
+    with pytest.raises(ValueError):
+        Table(dict(a=table['ID'], b=table.take([0])['ID']))
+
+
+def test_Table_filter_groupby(table):
+    assert [r['ID'] for r in table.filter(Language='a')] == ['1', '3']
+    assert [r['ID'] for r in table.filter(Language={'b', 'c', 'd'}, Form=bool)] == ['2']
+    assert len(table.filter(Form=lambda v: v > 'x', Language='c')) == 0
+
+    groups = table.groupby('Language')
+    assert [r['Form'] for r in groups['a']] == ['x', 'z']
+    assert set(table.groupby('Language', 'Form')) == {('a', 'x'), ('b', 'y'), ('a', 'z'), ('c', '')}
+
+
+def test_Table_join(table):
+    languages = Table.from_rows([
+        dict(ID='a', Glottocode='abcd1234', Name='A'),
+        dict(ID='b', Glottocode='', Name='B'),
+    ])
+    res = table.join(languages, on='Language', right_on='ID')
+    assert [r['Glottocode'] for r in res] == ['abcd1234', '', 'abcd1234', '']
+    assert [r['Name'] for r in res] == ['A', 'B', 'A', '']
+
+    res = table.join(languages, on='Language', right_on='ID', columns=['Name'], how='inner')
+    assert [(r['ID'], r['Name']) for r in res] == [('1', 'A'), ('2', 'B'), ('3', 'A')]
+    assert 'Glottocode' not in res.header
+
+    with pytest.raises(ValueError):
+        table.join(languages, on='Language', right_on='ID', columns=['ID'])
+    with pytest.raises(ValueError):
+        table.join(table, on='Language')
+
+
+@pytest.mark.parametrize('method,module', [('to_pandas', 'pandas'), ('to_arrow', 'pyarrow')])
+def test_Table_conversion(table, mocker, method, module):
+    mocker.patch.dict('sys.modules', {module: None})
+    with pytest.raises(EnvironmentError):
+        getattr(table, method)()
+
+    mod = mocker.Mock()
+    mocker.patch.dict('sys.modules', {module: mod})
+    getattr(table, method)()
+    assert (mod.DataFrame if module == 'pandas' else mod.table).called
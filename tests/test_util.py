@@ -1,8 +1,22 @@
-from cldfbench.util import iter_requirements
+import sys
+import importlib.metadata
 
+from cldfbench.util import iter_requirements, FREEZE_EXCLUDES
 
-def test_iter_requirements():
+
+def test_iter_requirements(mocker):
     res = [
         spec.split('==')[0] if '==' in spec else spec.split('=')[-1]
         for spec in iter_requirements()]
     assert 'pycldf' in res
+    assert res == [
+        spec.split('==')[0] if '==' in spec else spec.split('=')[-1]
+        for spec in iter_requirements()]
+
+    # Modules imported after the first call are picked up:
+    names = sorted((d.metadata['Name'] or '').lower() for d in importlib.metadata.distributions())
+    name = next(
+        n for n in names if n.isidentifier()
+        and n not in {r.lower() for r in res} | FREEZE_EXCLUDES)
+    mocker.patch.dict(sys.modules, {name: mocker.Mock()})
+    assert name in [spec.split('==')[0].lower() for spec in iter_requirements()]